@@ -2,8 +2,10 @@
 Google Cloud Run Jobs service for batch processing large repositories.
 """
 
+import hashlib
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -15,12 +17,29 @@ from .config import get_settings
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=2048)
+def _repo_hash(repo_url: str) -> str:
+    """Short, stable hash of a repository URL for job/execution names.
+
+    Cached because the same handful of repo URLs get hashed once per job,
+    execution, status poll and cancellation; usedforsecurity=False lets
+    OpenSSL take the fast MD5 path since this is just a name derivation.
+    """
+    return hashlib.md5(repo_url.encode(), usedforsecurity=False).hexdigest()[:8]
+
+
 class CloudRunJobsService:
     """Google Cloud Run Jobs service for batch repository processing."""
     
-    def __init__(self):
-        """Initialize Cloud Run Jobs client."""
-        self.settings = get_settings()
+    def __init__(self, settings=None):
+        """Initialize Cloud Run Jobs client.
+
+        Args:
+            settings: Optional Settings instance (tests pass one directly
+                instead of patching get_settings); when omitted the cached
+                process settings are used.
+        """
+        self.settings = settings if settings is not None else get_settings()
         self.client: Optional[run_v2.JobsClient] = None
         self._initialize_client()
     
@@ -35,11 +54,9 @@ class CloudRunJobsService:
     
     def _get_job_name(self, repo_url: str) -> str:
         """Get the full job name for Cloud Run Jobs."""
-        import hashlib
         # Create a safe job name from repo_url by hashing it
-        settings = get_settings()
-        repo_hash = hashlib.md5(repo_url.encode()).hexdigest()[:8]
-        return f"projects/{settings.gcp_project_id}/locations/{settings.cloud_run_jobs_location}/jobs/code-index-{repo_hash}"
+        repo_hash = _repo_hash(repo_url)
+        return f"projects/{self.settings.gcp_project_id}/locations/{self.settings.cloud_run_jobs_location}/jobs/code-index-{repo_hash}"
     
     def _get_execution_name(self, repo_url: str, execution_id: str) -> str:
         """Get the full execution name."""
@@ -51,14 +68,13 @@ class CloudRunJobsService:
         force_reprocess: bool = False
     ) -> Optional[str]:
         """Create a Cloud Run Job for processing a large repository."""
-        import hashlib
         try:
             if not self.client:
                 raise RuntimeError("Cloud Run Jobs client not initialized")
-            
+
             # Check if job already exists
             job_name = self._get_job_name(repo_url)
-            repo_hash = hashlib.md5(repo_url.encode()).hexdigest()[:8]
+            repo_hash = _repo_hash(repo_url)
             
                         # Create a simple job configuration
             job = Job()
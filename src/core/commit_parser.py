@@ -3,6 +3,7 @@
 Commit parser for incremental repository updates.
 """
 
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -28,7 +29,10 @@ class CommitParser:
     3. Processing only changed files with FileIndexer
     4. Updating repository metadata
     """
-    
+
+    # Files above this size are skipped without being read
+    MAX_FILE_BYTES = 1 << 20  # 1 MiB
+
     def __init__(self, db: FirestoreDatabase):
         """Initialize commit parser."""
         self.db = db
@@ -191,35 +195,83 @@ class CommitParser:
         skipped = 0
         
         changed_files = commit_info["changed_files"]
-        
+
+        # Classify first so the read batch only contains real work
+        to_read: List[tuple] = []
         for file_path in changed_files:
+            # Check if file is in allowed folders
+            if not self._is_file_in_allowed_folder(file_path):
+                logger.info(f"Skipping file {file_path} - not in allowed folder")
+                skipped += 1
+                continue
+
+            # Check if file was deleted
+            if file_path in commit_info["deleted_files"]:
+                # Handle file deletion (could mark as deleted in database)
+                logger.info(f"File deleted: {file_path}")
+                skipped += 1
+                continue
+
+            # Process added/modified files; one stat answers both the
+            # existence check and the size gate
+            full_path = Path(repo_path) / file_path
             try:
-                # Check if file is in allowed folders
-                if not self._is_file_in_allowed_folder(file_path):
-                    logger.info(f"Skipping file {file_path} - not in allowed folder")
-                    skipped += 1
-                    continue
-                
-                # Check if file was deleted
-                if file_path in commit_info["deleted_files"]:
-                    # Handle file deletion (could mark as deleted in database)
-                    logger.info(f"File deleted: {file_path}")
-                    skipped += 1
-                    continue
-                
-                # Process added/modified files
-                full_path = Path(repo_path) / file_path
-                if not full_path.exists():
-                    logger.warning(f"File not found: {file_path}")
-                    failed += 1
-                    continue
-                
-                # Read file content
-                file_content = full_path.read_text(encoding='utf-8', errors='ignore')
-                
+                size = full_path.stat().st_size
+            except OSError:
+                logger.warning(f"File not found: {file_path}")
+                failed += 1
+                continue
+
+            # Skip huge blobs (lockfiles, bundled assets): reading and
+            # decoding multi-MB files contributes nothing useful to the
+            # index and burns memory bandwidth
+            if size > self.MAX_FILE_BYTES:
+                logger.info(
+                    "Skipping file %s - %d bytes exceeds limit", file_path, size
+                )
+                skipped += 1
+                continue
+
+            to_read.append((file_path, full_path))
+
+        # Stream the reads through a bounded queue (the producer/consumer
+        # shape _process_repository_files uses) instead of gathering every
+        # decoded file into one list: a gather retains all contents at
+        # once, so a large commit could pin maxfiles * MAX_FILE_BYTES of
+        # memory. The queue caps what is alive to a handful of files
+        # while the producer's disk reads still overlap the Firestore
+        # round trips below.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+
+        def _read_decoded(path: Path) -> str:
+            # read_text routes every chunk through TextIOWrapper's
+            # incremental decoder; one bulk read plus a single decode
+            # call skips that machinery and copies the data once
+            return path.read_bytes().decode('utf-8', 'ignore')
+
+        async def _read_files() -> None:
+            for file_path, full_path in to_read:
+                try:
+                    content = await asyncio.to_thread(_read_decoded, full_path)
+                except Exception as e:
+                    content = e
+                await queue.put((file_path, content))
+            await queue.put(None)
+
+        reader = asyncio.create_task(_read_files())
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            file_path, file_content = item
+            try:
+                if isinstance(file_content, BaseException):
+                    raise file_content
+
                 # Determine language from file extension
                 language = self._get_language_from_path(file_path)
-                
+
                 # Process the file using FileIndexer
                 success = await self.file_indexer.process_file(
                     repo_url=repo_url,
@@ -229,18 +281,24 @@ class CommitParser:
                     file_content=file_content,
                     language=language
                 )
-                
+
                 if success:
                     processed += 1
                     logger.info(f"Successfully processed: {file_path}")
                 else:
                     failed += 1
                     logger.warning(f"Failed to process: {file_path}")
-                    
+
             except Exception as e:
                 logger.error(f"Error processing file {file_path}: {e}")
                 failed += 1
-        
+
+            # Drop the content before blocking on the next read so at
+            # most one consumed file outlives its queue slot
+            del file_content, item
+
+        await reader
+
         return {
             "processed": processed,
             "failed": failed,
@@ -4,6 +4,7 @@ Configuration management for the Serverless Code Index System.
 
 import os
 import json
+from functools import lru_cache
 from typing import Optional, List, Union
 from pathlib import Path
 from pydantic import Field, field_validator
@@ -147,10 +148,7 @@ class Settings(BaseSettings):
                 print(f"Config: No environment variable found for {field_name} (looking for {env_var})")
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
-    return settings
+    """Get application settings (built once, cached thereafter)."""
+    return Settings()
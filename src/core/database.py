@@ -13,7 +13,7 @@ from google.api_core import exceptions
 
 from .config import get_settings
 from ..models.repository import RepositoryMetadata
-from ..models.file_index import FileIndex
+from ..models.file_index import FILE_INDEX_LIST_ADAPTER, FileIndex
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +21,21 @@ logger = logging.getLogger(__name__)
 class FirestoreDatabase:
     """Firestore database client for code index operations."""
     
-    def __init__(self):
-        """Initialize Firestore client."""
-        self.settings = get_settings()
+    def __init__(self, settings=None, client: Optional[firestore.Client] = None):
+        """Initialize Firestore client.
+
+        Args:
+            settings: Optional Settings instance (tests pass one directly
+                instead of patching get_settings); when omitted the cached
+                process settings are used.
+            client: Optional pre-built client (tests inject an in-memory
+                fake here); when omitted a real client is constructed
+                from settings.
+        """
+        self.settings = settings if settings is not None else get_settings()
         print(f"Initializing Firestore client with database ID: {self.settings.firestore_database_id}")
         print(f"Initializing Firestore client with collection prefix: {self.settings.firestore_collection_prefix}")
-        self.client = firestore.Client.from_service_account_json(
+        self.client = client if client is not None else firestore.Client.from_service_account_json(
                     self.settings.service_account_key_path,
                     project=self.settings.gcp_project_id,
                     database=self.settings.firestore_database_id or "(default)"
@@ -157,7 +166,7 @@ class FirestoreDatabase:
             # Create a unique document ID using repo and file path
             doc_id = f"{file_index.repoId}_{file_index.filePath.replace('/', '_')}"
             doc_ref = self._get_document_ref("file_indexes", doc_id)
-            doc_ref.set(file_index.model_dump())
+            doc_ref.set(file_index.model_dump(mode='python', exclude_none=True))
             
             logger.info(f"File index created: {doc_id}")
             return True
@@ -192,16 +201,21 @@ class FirestoreDatabase:
             query = collection.where(filter=FieldFilter("repoId", "==", repo_url))
             docs = query.stream()
             
-            file_indexes = []
-            for doc in docs:
-                try:
-                    file_index_data = FileIndex(**doc.to_dict())
-                    file_indexes.append(file_index_data)
-                except Exception as e:
-                    logger.warning(f"Failed to parse file index document {doc.id}: {e}")
-                    continue
-            
-            return file_indexes
+            rows = [doc.to_dict() for doc in docs]
+            try:
+                # Fast path: one compiled validator pass over the batch
+                return FILE_INDEX_LIST_ADAPTER.validate_python(rows)
+            except Exception:
+                # Fall back to per-document validation so one malformed
+                # document doesn't discard the rest of the listing
+                file_indexes = []
+                for row in rows:
+                    try:
+                        file_indexes.append(FileIndex(**row))
+                    except Exception as e:
+                        logger.warning(f"Failed to parse file index document: {e}")
+                        continue
+                return file_indexes
             
         except Exception as e:
             logger.error(f"Failed to list file indexes for repository {repo_url}: {e}")
@@ -249,7 +263,7 @@ class FirestoreDatabase:
             for file_index in file_indexes:
                 doc_id = f"{file_index.repoId}_{file_index.filePath.replace('/', '_')}"
                 doc_ref = self._get_document_ref("file_indexes", doc_id)
-                batch.set(doc_ref, file_index.model_dump())
+                batch.set(doc_ref, file_index.model_dump(mode='python', exclude_none=True))
             
             batch.commit()
             logger.info(f"Batch write completed for {len(file_indexes)} file indexes")
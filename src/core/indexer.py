@@ -11,7 +11,7 @@ from google.cloud import firestore
 
 from src.core.database import FirestoreDatabase
 
-from ..models.file_index import FileIndex, ExportInfo, ImportInfo
+from ..models.file_index import FILE_INDEX_LIST_ADAPTER, FileIndex, ExportInfo, ImportInfo
 from ..models.repository import RepositoryMetadata
 from .locks import FileLock
 
@@ -35,9 +35,9 @@ class FileIndexer:
         """
         self.db = db
         
-        # Initialize CodeParser for extracting exports/imports
-        from src.core.parser import CodeParser
-        self.parser = CodeParser()
+        # Shared CodeParser for extracting exports/imports
+        from src.core.parser import get_code_parser
+        self.parser = get_code_parser()
     
     async def should_process_file(self, repo_url: str, file_path: str, file_hash: str) -> bool:
         """
@@ -110,11 +110,13 @@ class FileIndexer:
         file_content: str,
         language: str,
         exports: Optional[List[ExportInfo]] = None,
-        imports: Optional[List[ImportInfo]] = None
+        imports: Optional[List[ImportInfo]] = None,
+        file_hash: Optional[str] = None,
+        bulk_writer=None
     ) -> bool:
         """
         Process a file with two-layer deduplication.
-        
+
         Args:
             repo_url: Repository URL
             file_path: Relative path within repository
@@ -124,7 +126,12 @@ class FileIndexer:
             language: Programming language identifier
             exports: Parsed export information (optional, will parse if not provided)
             imports: Parsed import information (optional, will parse if not provided)
-            
+            file_hash: Precomputed content hash; when provided, skips the
+                git/content hashing pass here
+            bulk_writer: Optional Firestore BulkWriter; when provided, the
+                file index write is enqueued on it instead of issuing an
+                immediate per-document round trip
+
         Returns:
             True if file was processed, False if skipped
         """
@@ -136,8 +143,10 @@ class FileIndexer:
             #     logger.info(f"Skipping file {file_path} with older modification timestamp {file_timestamp}")
             #     return False
             
-            # Second: Check file content hash using git ls-files
-            file_hash = await self._get_git_file_hash(file_path, file_content)
+            # Second: Check file content hash (precomputed by callers that
+            # already streamed the file, otherwise via git ls-files)
+            if file_hash is None:
+                file_hash = await self._get_git_file_hash(file_path, file_content)
             logger.info(f"File {file_path} hash: {file_hash[:8]}...")
             
             # Temporarily disable hash check for testing
@@ -166,8 +175,9 @@ class FileIndexer:
             # Process the file directly (temporarily disable locking for testing)
             logger.info(f"Indexing file {file_path}...")
             await self._index_file_with_lock(
-                repo_url, file_path, commit_sha, file_timestamp, 
-                file_hash, language, exports, imports, None
+                repo_url, file_path, commit_sha, file_timestamp,
+                file_hash, language, exports, imports, None,
+                bulk_writer=bulk_writer
             )
             
             logger.info(f"Successfully processed file {file_path}")
@@ -177,6 +187,47 @@ class FileIndexer:
             logger.error(f"Error processing file {file_path}: {e}")
             return False
     
+    def build_file_index_doc(
+        self,
+        repo_url: str,
+        file_path: str,
+        commit_sha: str,
+        file_timestamp: str,
+        file_hash: str,
+        language: str,
+        exports: List[ExportInfo],
+        imports: List[ImportInfo]
+    ):
+        """
+        Build the Firestore write for a file index without issuing it.
+
+        Returns:
+            Tuple of (document reference, payload dict) ready for
+            doc_ref.set(), a WriteBatch, or a BulkWriter
+        """
+        file_index = FileIndex(
+            repoId=repo_url,
+            filePath=file_path,
+            fileHash=file_hash,
+            lastCommitSHA=commit_sha,
+            lastCommitTimestamp=file_timestamp,
+            exports=exports,
+            imports=imports,
+            updatedAt=datetime.utcnow().isoformat() + 'Z',
+            language=language,
+            parseErrors=[]
+        )
+
+        # Deterministic document ID, same scheme as create_file_index:
+        # re-runs overwrite the file's document instead of piling up
+        # auto-ID duplicates, and the skip-unchanged prefetch can find
+        # it by ID. exclude_none skips serializing the unset Optional
+        # fields (functionSignature/classInfo/interfaceInfo on most
+        # exports), which is the bulk of model_dump's per-file cost.
+        doc_id = f"{repo_url}_{file_path.replace('/', '_')}"
+        doc_ref = self.db.file_indexes.document(doc_id)
+        return doc_ref, file_index.model_dump(mode='python', exclude_none=True)
+
     async def _index_file_with_lock(
         self,
         repo_url: str,
@@ -187,27 +238,22 @@ class FileIndexer:
         language: str,
         exports: List[ExportInfo],
         imports: List[ImportInfo],
-        file_lock: Optional[FileLock] = None
+        file_lock: Optional[FileLock] = None,
+        bulk_writer=None
     ):
         """Index file while holding the distributed lock (optional for testing)."""
         try:
-            # Create or update file index
-            file_index = FileIndex(
-                repoId=repo_url,
-                filePath=file_path,
-                fileHash=file_hash,
-                lastCommitSHA=commit_sha,
-                lastCommitTimestamp=file_timestamp,
-                exports=exports,
-                imports=imports,
-                updatedAt=datetime.utcnow().isoformat() + 'Z',
-                language=language,
-                parseErrors=[]
+            doc_ref, doc = self.build_file_index_doc(
+                repo_url, file_path, commit_sha, file_timestamp,
+                file_hash, language, exports, imports
             )
-            
-            # Store in Firestore with auto-generated document ID
-            doc_ref = self.db.file_indexes.document()
-            doc_ref.set(file_index.model_dump())
+
+            if bulk_writer is not None:
+                # Enqueue on the BulkWriter; it coalesces writes into
+                # batched RPCs and sends them from its own thread pool
+                bulk_writer.set(doc_ref, doc)
+            else:
+                doc_ref.set(doc)
             
             # Update repository metadata
             await self._update_repository_metadata(repo_url, commit_sha, file_timestamp)
@@ -280,36 +326,25 @@ class FileIndexer:
     
     async def _get_git_file_hash(self, file_path: str, file_content: str) -> str:
         """
-        Get file hash using git ls-files command.
-        
+        Compute the git blob hash of the file content.
+
         Args:
             file_path: Relative path within repository
-            file_content: File content as fallback
-            
+            file_content: File content to hash
+
         Returns:
-            Git object hash or fallback hash
+            Git object hash of the content
         """
-        try:
-            import subprocess
-            # Note: This requires the working directory to be the repository root
-            # The caller should ensure this
-            result = subprocess.run(
-                ['git', 'ls-files', '--format=%(objectname)', file_path],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            file_hash = result.stdout.strip()
-            if file_hash:
-                logger.info(f"Using git hash for {file_path}: {file_hash[:8]}...")
-                return file_hash
-        except Exception as e:
-            logger.info(f"Git hash not available for {file_path}, using content hash: {e}")
-        
-        # Fallback to content hash if git command fails
-        content_hash = hashlib.sha256(file_content.encode()).hexdigest()
-        logger.info(f"Using content hash for {file_path}: {content_hash[:8]}...")
-        return content_hash
+        # git's objectname for a blob is SHA-1 over a "blob <len>\0"
+        # header plus the content, so computing it in-process yields the
+        # same digest `git ls-files --format=%(objectname)` reported —
+        # without a fork/exec round trip per file
+        data = file_content.encode()
+        file_hash = hashlib.sha1(
+            b"blob %d\x00" % len(data) + data, usedforsecurity=False
+        ).hexdigest()
+        logger.debug("Content hash for %s: %s...", file_path, file_hash[:8])
+        return file_hash
     
     async def get_repository_metadata(self, repo_url: str) -> Optional[RepositoryMetadata]:
         """
@@ -347,15 +382,20 @@ class FileIndexer:
             query = self.db.file_indexes.where(filter=firestore.FieldFilter('repoId', '==', repo_url))
             docs = query.stream()
             
-            file_indexes = []
-            for doc in docs:
-                try:
-                    file_indexes.append(FileIndex(**doc.to_dict()))
-                except Exception as e:
-                    logger.warning(f"Error parsing file index {doc.id}: {e}")
-                    continue
-            
-            return file_indexes
+            rows = [doc.to_dict() for doc in docs]
+            try:
+                # Fast path: validate the whole batch in one adapter pass
+                return FILE_INDEX_LIST_ADAPTER.validate_python(rows)
+            except Exception:
+                # Per-document fallback keeps valid entries when one is bad
+                file_indexes = []
+                for row in rows:
+                    try:
+                        file_indexes.append(FileIndex(**row))
+                    except Exception as e:
+                        logger.warning(f"Error parsing file index: {e}")
+                        continue
+                return file_indexes
             
         except Exception as e:
             logger.error(f"Error listing file indexes for {repo_url}: {e}")
@@ -5,12 +5,13 @@ Code parsing engine using Tree-sitter for multi-language support.
 from .base import LanguageParser, ParseResult
 from .typescript import TypeScriptParser
 from .python import PythonParser
-from .main import CodeParser
+from .main import CodeParser, get_code_parser
 
 __all__ = [
     'LanguageParser',
-    'ParseResult', 
+    'ParseResult',
     'TypeScriptParser',
     'PythonParser',
-    'CodeParser'
+    'CodeParser',
+    'get_code_parser'
 ]
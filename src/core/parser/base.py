@@ -11,7 +11,9 @@ logger = logging.getLogger(__name__)
 
 class ParseResult:
     """Result of parsing a file."""
-    
+
+    __slots__ = ('exports', 'imports', 'language', 'parse_errors')
+
     def __init__(self):
         self.exports: List = []
         self.imports: List = []
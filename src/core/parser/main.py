@@ -3,8 +3,9 @@ Main code parser that delegates to language-specific parsers.
 """
 
 import logging
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from .base import LanguageParser, ParseResult
 from .typescript import TypeScriptParser
@@ -102,10 +103,35 @@ class CodeParser:
             return result
         
         try:
-            print(f"Parsing {file_path} with {language} parser")
+            # Per-file print serialized the parse loop on the stdout lock;
+            # gate the diagnostic behind the debug level instead
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Parsing %s with %s parser", file_path, language)
+            # Parse in-process: single files are cheap enough that the
+            # pickling and round trip of a worker process would dominate,
+            # and staying in-process keeps the parser's caches warm.
+            # Batch callers that want cross-core parallelism use the
+            # explicit parse_many process-pool path instead.
             return parser.parse(content)
         except Exception as e:
             result = ParseResult()
             result.language = language
             result.parse_errors.append(f"Error parsing {language} file: {e}")
             return result
+
+
+# Process-wide parser instance. Building a CodeParser constructs the
+# tree-sitter parsers for every supported language, so each component
+# creating its own copy repeats that work; share one instead.
+_shared_parser: Optional[CodeParser] = None
+_shared_parser_lock = threading.Lock()
+
+
+def get_code_parser() -> CodeParser:
+    """Return the shared CodeParser, building it on first use."""
+    global _shared_parser
+    if _shared_parser is None:
+        with _shared_parser_lock:
+            if _shared_parser is None:
+                _shared_parser = CodeParser()
+    return _shared_parser
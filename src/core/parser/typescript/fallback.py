@@ -1,37 +1,87 @@
+# Prefer a linear-time (DFA-backed) regex engine when one is installed;
+# the patterns used here avoid backreferences so they stay compatible.
+try:
+    import re2 as re  # type: ignore[import-not-found]
+except ImportError:
+    try:
+        import regex as re  # type: ignore[import-not-found]
+    except ImportError:
+        import re
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Tuple
+
 from src.models.file_index import FunctionSignature, Parameter
 
+# Shared empty parameter list for no-arg functions; Pydantic copies list
+# fields on validation, so handing out the same object is safe.
+_EMPTY_PARAMS: list = []
+
+# LRU of parsed signatures keyed by (content digest, function name), so
+# re-reads of an unchanged file skip the regex scan entirely.
+_SIGNATURE_CACHE: "OrderedDict[Tuple[bytes, str], FunctionSignature]" = OrderedDict()
+_SIGNATURE_CACHE_SIZE: int = 1024
+
+
+def _default_signature() -> FunctionSignature:
+    """Build the default signature returned when no definition is found."""
+    return FunctionSignature(
+        parameters=[],
+        returnType="any",
+        isAsync=False,
+        isGenerator=False,
+        overloads=[]
+    )
+
 
 class TypescriptFallbackParser:
     """Parser for TypeScript fallback scenarios when Tree-sitter fails."""
-    
+
     def __init__(self):
         pass
-    
+
     def parse_function_signature(self, func_name: str, content: str, line_num: int) -> FunctionSignature:
         """Parse function signature using regex fallback."""
-        import re
-        
+        # Cheap substring prefilter before running the regex engine
+        if 'export' not in content or 'function' not in content:
+            return _default_signature()
+
+        # Encode once: the bytes feed both the cache digest and the regex.
+        # Matching on bytes keeps the engine in its narrow ASCII fast path
+        # instead of per-codepoint Unicode handling.
+        content_bytes = content.encode('utf8')
+
+        # Re-reads of an unchanged file hit the digest-keyed cache
+        digest = hashlib.blake2b(content_bytes, digest_size=8).digest()
+        cache_key = (digest, func_name)
+        cached = _SIGNATURE_CACHE.get(cache_key)
+        if cached is not None:
+            _SIGNATURE_CACHE.move_to_end(cache_key)
+            return cached
+
         # Find the function definition
-        func_pattern = rf'export\s+function\s+{re.escape(func_name)}\s*\(([^)]*)\)\s*(?::\s*(\w+))?'
-        func_match = re.search(func_pattern, content)
-        
+        func_pattern = (
+            rb'export\s+function\s+' + re.escape(func_name).encode('utf8')
+            + rb'\s*\(([^)]*)\)\s*(?::\s*(\w+))?'
+        )
+        func_match = re.search(func_pattern, content_bytes)
+
         if not func_match:
-            return FunctionSignature(
-                parameters=[],
-                returnType="any",
-                isAsync=False,
-                isGenerator=False,
-                overloads=[]
-            )
-        
-        # Extract parameters
-        params_text = func_match.group(1)
-        parameters = []
-        if params_text.strip():
-            param_names = [p.strip().split(':')[0].strip() for p in params_text.split(',')]
+            return _default_signature()
+
+        # Extract parameters (decode only the small matched groups)
+        params_text: str = func_match.group(1).decode('utf8')
+        parameters: List[Parameter] = _EMPTY_PARAMS
+        if params_text and not params_text.isspace():
+            parameters = []
+            param_names: List[str] = [p.partition(':')[0].strip() for p in params_text.split(',')]
             for param_name in param_names:
                 if param_name:
-                    parameters.append(Parameter(
+                    # model_construct skips field validation; every value
+                    # here is a known-good literal except the name, which
+                    # is a plain str by construction.
+                    parameters.append(Parameter.model_construct(
                         name=param_name,
                         type="any",
                         required=True,
@@ -40,18 +90,23 @@ class TypescriptFallbackParser:
                     ))
         
         # Extract return type
-        return_type = func_match.group(2) if func_match.group(2) else "any"
-        
+        return_type: str = func_match.group(2).decode('utf8') if func_match.group(2) else "any"
+
         # Check if async
-        is_async = 'async' in content[:func_match.start()]
-        
+        is_async: bool = b'async' in content_bytes[:func_match.start()]
+
         # Check if generator
-        is_generator = '*' in content[:func_match.start()]
+        is_generator: bool = b'*' in content_bytes[:func_match.start()]
         
-        return FunctionSignature(
+        signature = FunctionSignature(
             parameters=parameters,
             returnType=return_type,
             isAsync=is_async,
             isGenerator=is_generator,
             overloads=[]
         )
+
+        _SIGNATURE_CACHE[cache_key] = signature
+        if len(_SIGNATURE_CACHE) > _SIGNATURE_CACHE_SIZE:
+            _SIGNATURE_CACHE.popitem(last=False)
+        return signature
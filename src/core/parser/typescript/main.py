@@ -2,10 +2,18 @@
 TypeScript/JavaScript parser using Tree-sitter.
 """
 
+import bisect
+import hashlib
 import logging
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Final, List, Optional
-from tree_sitter import Language, Node, Parser
+from typing import Final, List, Optional, Tuple
+from tree_sitter import Language, Node, Parser, Tree
 import tree_sitter_typescript as ts_typescript
 
 from src.models.file_index import ExportInfo, ImportInfo, FunctionSignature, Parameter, ClassInfo, InterfaceInfo
@@ -15,6 +23,56 @@ from .fallback import TypescriptFallbackParser
 
 logger = logging.getLogger(__name__)
 
+# One hot Parser per thread; its internal buffers are reused across
+# parse() calls, and Parser objects are not thread-safe to share.
+_tls = threading.local()
+
+# Fallback export pattern: all export forms combined into one alternation
+# so the content is scanned once instead of once per form. The named group
+# that matched identifies the export type.
+_EXPORT_PATTERN: Final[re.Pattern] = re.compile(
+    r'export\s+(?:'
+    r'function\s+(?P<function>\w+)'
+    r'|class\s+(?P<cls>\w+)'
+    r'|interface\s+(?P<interface>\w+)'
+    r'|(?:const|let|var)\s+(?P<variable>\w+)'
+    r'|type\s+(?P<type>\w+)'
+    r'|{\s*(?P<clause>\w+)(?:\s*,\s*\w+)*\s*}'
+    r'|default\s+(?P<default>\w+)'
+    r'|(?P<assign>\w+)\s*=\s*\w+'
+    r')',
+    re.MULTILINE,
+)
+# Named group -> ExportInfo type tag
+_EXPORT_GROUP_TYPES: Final[dict] = {
+    'function': 'function',
+    'cls': 'class',
+    'interface': 'interface',
+    'variable': 'variable',
+    'type': 'type',
+    'clause': 'variable',
+    'default': 'variable',
+    'assign': 'variable',
+}
+_IMPORT_PATTERN: Final[re.Pattern] = re.compile(
+    r'import\s+(?:\{[^}]*\}|\w+)\s+from\s+[\'"]([^\'"]+)[\'"]', re.MULTILINE
+)
+
+
+def _id(node: Node) -> str:
+    """Decode an identifier node; identifiers carry no surrounding whitespace."""
+    return node.text.decode('utf8')
+
+
+def _newline_offsets(content: str) -> List[int]:
+    """Collect the offset of every newline for bisect-based line lookup."""
+    offsets = []
+    pos = content.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = content.find('\n', pos + 1)
+    return offsets
+
 
 class TypeScriptParser(LanguageParser):
     """TypeScript/JavaScript parser using Tree-sitter."""
@@ -22,33 +80,74 @@ class TypeScriptParser(LanguageParser):
     EXTENSIONS: Final[List[str]] = ['.ts', '.tsx', '.js', '.jsx']
     LANGUAGE_NAME: Final[str] = 'typescript'
     LANGUAGE: Final[Language] = Language(ts_typescript.language_typescript())
-    
+
+    # LRU of parse results keyed by content hash, shared across parser
+    # instances; re-scans of unchanged files skip the parse and tree walk.
+    _parse_cache: "OrderedDict[bytes, ParseResult]" = OrderedDict()
+    _PARSE_CACHE_SIZE: Final[int] = 1024
+
+    # Last parsed tree per file path, for incremental reparse
+    _TREE_CACHE_SIZE: Final[int] = 10
+
     def __init__(self):
         super().__init__()
-        self.parser = Parser(language=TypeScriptParser.LANGUAGE)
         self.class_parser = TypescriptClassParser()
         self.fallback_parser = TypescriptFallbackParser()
+        self._tree_cache: "OrderedDict[str, Tree]" = OrderedDict()
+
+    @property
+    def parser(self) -> Parser:
+        """Thread-local Parser, created on first use per thread."""
+        parser = getattr(_tls, 'parser', None)
+        if parser is None:
+            parser = _tls.parser = Parser(language=TypeScriptParser.LANGUAGE)
+        return parser
     
     def detect_language(self, file_path: str) -> bool:
         """Check if file is TypeScript."""
         ext = Path(file_path).suffix.lower()
         return ext in TypeScriptParser.EXTENSIONS
     
-    def parse(self, content: str) -> ParseResult:
-        """Parse TypeScript content."""
+    def parse(self, content: str, file_path: Optional[str] = None,
+              edits: Optional[List[tuple]] = None) -> ParseResult:
+        """Parse TypeScript content.
+
+        When file_path and edits are given, the previous tree for that path
+        is edited and tree-sitter reparses only the changed subtrees. Each
+        edit is a (start_byte, old_end_byte, new_end_byte, start_point,
+        old_end_point, new_end_point) tuple.
+        """
+        content_bytes = content.encode('utf8')
+        cache_key = hashlib.sha256(content_bytes).digest()
+        cached = TypeScriptParser._parse_cache.get(cache_key)
+        if cached is not None:
+            TypeScriptParser._parse_cache.move_to_end(cache_key)
+            return cached
+
         result = ParseResult()
         result.language = TypeScriptParser.LANGUAGE_NAME
-        
+
         try:
-            # Try Tree-sitter parsing first
-            tree = self.parser.parse(content.encode('utf8'))
+            # Try Tree-sitter parsing first, incrementally when possible
+            old_tree = None
+            if file_path is not None and edits:
+                old_tree = self._tree_cache.get(file_path)
+                if old_tree is not None:
+                    for edit in edits:
+                        old_tree.edit(*edit)
+            if old_tree is not None:
+                tree = self.parser.parse(content_bytes, old_tree)
+            else:
+                tree = self.parser.parse(content_bytes)
+            if file_path is not None:
+                self._tree_cache[file_path] = tree
+                self._tree_cache.move_to_end(file_path)
+                if len(self._tree_cache) > TypeScriptParser._TREE_CACHE_SIZE:
+                    self._tree_cache.popitem(last=False)
             root_node = tree.root_node
-            logger.info("---------------TREEE-----------------")
-            logger.info(tree)
-            
-            # Extract exports and imports
-            result.exports = self._extract_exports(root_node, content)
-            result.imports = self._extract_imports(root_node, content)
+
+            # Extract exports and imports in one pass
+            result.exports, result.imports = self._extract_top_level(root_node, content)
             
             
         except Exception as e:
@@ -56,77 +155,84 @@ class TypeScriptParser(LanguageParser):
             # Fallback to simple regex parsing
             result.exports = self._extract_exports_regex(content)
             result.imports = self._extract_imports_regex(content)
-        
+
+        TypeScriptParser._parse_cache[cache_key] = result
+        if len(TypeScriptParser._parse_cache) > TypeScriptParser._PARSE_CACHE_SIZE:
+            TypeScriptParser._parse_cache.popitem(last=False)
         return result
     
-    def _extract_exports(self, root_node: Node, content: str) -> List[ExportInfo]:
-        """Extract export declarations from AST."""
-        exports = []
-        
-        # Find export statements
-        export_nodes = self._find_nodes_by_type(root_node, 'export_statement')
-        
-        for export_node in export_nodes:
-            try:
-                export_info = self._parse_export_node(export_node, content)
-                if export_info:
-                    exports.append(export_info)
-            except Exception as e:
-                logger.warning(f"Error parsing export node: {e}")
-                continue
-        
-        return exports
-    
-    def _extract_imports(self, root_node: Node, content: str) -> List[ImportInfo]:
-        """Extract import declarations from AST."""
-        imports = []
-        
-        # Find import statements
-        import_nodes = self._find_nodes_by_type(root_node, 'import_statement')
-        
-        for import_node in import_nodes:
-            try:
-                import_info = self._parse_import_node(import_node, content)
-                if import_info:
-                    imports.append(import_info)
-            except Exception as e:
-                logger.warning(f"Error parsing import node: {e}")
-                continue
-        
-        return imports
-    
-    def _parse_export_node(self, export_node: Node, content: str) -> Optional[ExportInfo]:
-        """Parse an export node into ExportInfo."""
-        try:
-            # Get line number
-            line_number = export_node.start_point[0] + 1
-            
-            # Check export type
-            if self._has_child_type(export_node, 'function_declaration'):
-                print("function declaration")
-                return self._parse_function_export(export_node, content, line_number)
-            elif self._has_child_type(export_node, 'class_declaration'):
-                print("class declaration")
-                return self._parse_class_export(export_node, content, line_number)
-            elif self._has_child_type(export_node, 'interface_declaration'):
-                print("interface declaration")
-                return self._parse_interface_export(export_node, content, line_number)
-            elif self._has_child_type(export_node, 'variable_declaration'):
-                print("variable declaration")
-                return self._parse_variable_export(export_node, content, line_number)
-            else:
-                # Generic export
-                print("generic export")
-                return ExportInfo(
-                    name=self._extract_export_name(export_node),
-                    type="variable",
-                    visibility="public",
-                    lineNumber=line_number
-                )
-                
-        except Exception as e:
-            logger.warning(f"Error parsing export node: {e}")
-            return None
+    def parse_path(self, path: str) -> ParseResult:
+        """Parse a file by handing its mmap-ed bytes straight to tree-sitter.
+
+        Skips the file-read -> decode -> re-encode round-trip of parse():
+        the OS pages the file in lazily and no str copy of the content is
+        ever built. Only the regex fallback decodes the full buffer.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.parse('', file_path=path)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                cache_key = hashlib.sha256(mm).digest()
+                cached = TypeScriptParser._parse_cache.get(cache_key)
+                if cached is not None:
+                    TypeScriptParser._parse_cache.move_to_end(cache_key)
+                    return cached
+
+                result = ParseResult()
+                result.language = TypeScriptParser.LANGUAGE_NAME
+
+                try:
+                    tree = self.parser.parse(mm)
+                    result.exports, result.imports = self._extract_top_level(tree.root_node, '')
+                except Exception as e:
+                    logger.info(f"Tree-sitter parsing failed, using regex fallback: {e}")
+                    content = mm[:].decode('utf-8', errors='ignore')
+                    result.exports = self._extract_exports_regex(content)
+                    result.imports = self._extract_imports_regex(content)
+
+                TypeScriptParser._parse_cache[cache_key] = result
+                if len(TypeScriptParser._parse_cache) > TypeScriptParser._PARSE_CACHE_SIZE:
+                    TypeScriptParser._parse_cache.popitem(last=False)
+                return result
+
+    def _extract_top_level(self, root_node: Node, content: str) -> Tuple[List[ExportInfo], List[ImportInfo]]:
+        """Extract exports and imports in a single pass over top-level statements."""
+        exports: List[ExportInfo] = []
+        imports: List[ImportInfo] = []
+
+        # Export/import statements only occur as direct children of the
+        # program node, so one flat pass covers both. Unexpected failures
+        # propagate to parse(), which routes to the regex fallback.
+        for child in root_node.children:
+            if child.type == 'export_statement':
+                exports.extend(self._parse_export_node(child, content))
+            elif child.type == 'import_statement':
+                import_infos = self._extract_import_node(child, content)
+                if import_infos:
+                    imports.extend(import_infos)
+
+        return exports, imports
+
+    def _parse_export_node(self, export_node: Node, content: str) -> List[ExportInfo]:
+        """Parse an export node into a list of ExportInfo."""
+        # Get line number
+        line_number = export_node.start_point[0] + 1
+
+        # One pass over the children instead of a scan per candidate type
+        child_types = {child.type for child in export_node.children}
+        for child_type, handler in TypeScriptParser._EXPORT_DISPATCH.items():
+            if child_type in child_types:
+                export_info = handler(self, export_node, content, line_number)
+                return [export_info] if export_info else []
+
+        # Export clause (export { a, b, c }) or other generic export
+        names = self._extract_export_names(export_node)
+        if not names:
+            names = ["exported_item"]
+        return [
+            ExportInfo(name=name, type="variable", visibility="public", lineNumber=line_number)
+            for name in names
+        ]
     
     def _parse_function_export(self, export_node: Node, content: str, line_number: int) -> ExportInfo:
         """Parse a function export."""
@@ -212,89 +318,92 @@ class TypeScriptParser(LanguageParser):
     
     def _parse_variable_export(self, export_node: Node, content: str, line_number: int) -> ExportInfo:
         """Parse a variable export."""
-        var_node = self._find_child_by_type(export_node, 'variable_declaration')
+        # const/let produce lexical_declaration, var produces variable_declaration
+        var_node = (self._find_child_by_type(export_node, 'lexical_declaration')
+                    or self._find_child_by_type(export_node, 'variable_declaration'))
         if not var_node:
             return None
-        
+
         # Extract variable name
         name = self._extract_variable_name(var_node)
-        
+
         return ExportInfo(
             name=name,
             type="variable",
             visibility="public",
             lineNumber=line_number
         )
+
+    # Export child type -> handler, checked in declaration order against
+    # the set of child types built once per export node.
+    _EXPORT_DISPATCH: Final[dict] = {
+        'function_declaration': _parse_function_export,
+        'class_declaration': _parse_class_export,
+        'interface_declaration': _parse_interface_export,
+        'variable_declaration': _parse_variable_export,
+        'lexical_declaration': _parse_variable_export,
+    }
     
     def _extract_function_parameters(self, func_node: Node, content: str) -> List[Parameter]:
         """Extract function parameters."""
         parameters = []
         
-        # Find parameter list
-        param_list = self._find_child_by_type(func_node, 'formal_parameters')
+        # Find parameter list (O(1) field lookup)
+        param_list = func_node.child_by_field_name('parameters')
         if not param_list:
             return parameters
         
         # Extract individual parameters
         param_nodes = self._find_nodes_by_type(param_list, 'required_parameter')
-        
+
         for param_node in param_nodes:
-            try:
-                param_name = self._extract_node_text(param_node, content)
-                param_type = self._extract_parameter_type(param_node, content)
-                
-                parameters.append(Parameter(
-                    name=param_name,
-                    type=param_type or "any",
-                    required=True,
-                    defaultValue=None,
-                    description=None
-                ))
-            except Exception as e:
-                logger.warning(f"Error parsing parameter: {e}")
-                continue
-        
+            param_name = self._extract_node_text(param_node, content)
+            param_type = self._extract_parameter_type(param_node, content)
+
+            parameters.append(Parameter(
+                name=param_name,
+                type=param_type or "any",
+                required=True,
+                defaultValue=None,
+                description=None
+            ))
+
         return parameters
     
-    def _extract_import_node(self, import_node: Node, content: str) -> Optional[ImportInfo]:
+    def _extract_import_node(self, import_node: Node, content: str) -> List[ImportInfo]:
         """Parse an import node into ImportInfo."""
-        try:
-            # Get line number
-            line_number = import_node.start_point[0] + 1
-            
-            # Extract import source
-            source = self._extract_import_source(import_node, content)
-            
-            # Extract import names
-            names = self._extract_import_names(import_node, content)
-            
-            # Create import info for each imported item
-            imports = []
-            for name in names:
-                imports.append(ImportInfo(
-                    name=name,
-                    source=source,
-                    lineNumber=line_number
-                ))
-            
-            return imports
-            
-        except Exception as e:
-            logger.warning(f"Error parsing import node: {e}")
-            return None
+        # Get line number
+        line_number = import_node.start_point[0] + 1
+
+        # Extract import source
+        source = self._extract_import_source(import_node, content)
+
+        # Extract import names
+        names = self._extract_import_names(import_node, content)
+
+        # Create import info for each imported item
+        return [
+            ImportInfo(name=name, source=source, lineNumber=line_number)
+            for name in names
+        ]
     
     # Helper methods for AST traversal
     def _find_nodes_by_type(self, root: Node, node_type: str) -> List[Node]:
         """Find all nodes of a specific type in the AST."""
+        # Iterative TreeCursor walk: no Python frame per node and no
+        # materialized child lists, unlike the old recursive closure.
         nodes = []
-        
-        def traverse(node):
-            if node.type == node_type:
-                nodes.append(node)
-            for child in node.children:
-                traverse(child)
-        
-        traverse(root)
+        cursor = root.walk()
+        reached_end = False
+        while not reached_end:
+            if cursor.node.type == node_type:
+                nodes.append(cursor.node)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    reached_end = True
+                    break
         return nodes
     
     def _find_child_by_type(self, parent: Node, child_type: str) -> Optional[Node]:
@@ -306,39 +415,46 @@ class TypeScriptParser(LanguageParser):
     
     def _has_child_type(self, parent: Node, child_type: str) -> bool:
         """Check if parent has a child of specific type."""
-        return self._find_child_by_type(parent, child_type) is not None
+        return any(child.type == child_type for child in parent.children)
     
     def _extract_node_text(self, node: Node, content: str) -> str:
         """Extract text content from a node."""
-        start_byte = node.start_byte
-        end_byte = node.end_byte
-        return content[start_byte:end_byte].strip()
-    
-    def _extract_export_name(self, export_node: Node) -> str:
-        """Extract the name from an export statement."""
-        # This is a simplified implementation
-        # In practice, you'd need to handle different export patterns
-        return "exported_item"
+        # node.text is the exact bytes slice for the node; slicing the str
+        # with byte offsets is wrong for any non-ASCII content and forces a
+        # second full copy of the file alongside the parsed bytes.
+        return node.text.decode('utf8').strip()
+    
+    def _extract_export_names(self, export_node: Node) -> List[str]:
+        """Extract the exported names from an export clause."""
+        clause = self._find_child_by_type(export_node, 'export_clause')
+        names = []
+        if clause:
+            for specifier in clause.children:
+                if specifier.type == 'export_specifier':
+                    name_node = specifier.child_by_field_name('name')
+                    if name_node:
+                        names.append(_id(name_node))
+        return names
     
     def _extract_function_name(self, func_node: Node) -> str:
         """Extract function name from function declaration."""
-        name_node = self._find_child_by_type(func_node, 'identifier')
+        name_node = func_node.child_by_field_name('name')
         if name_node:
-            return name_node.text.decode('utf8')
+            return _id(name_node)
         return "anonymous_function"
     
     def _extract_class_name(self, class_node: Node) -> str:
         """Extract class name from class declaration."""
-        name_node = self._find_child_by_type(class_node, 'type_identifier')
+        name_node = class_node.child_by_field_name('name')
         if name_node:
-            return name_node.text.decode('utf8')
+            return _id(name_node)
         return "anonymous_class"
     
     def _extract_interface_name(self, interface_node: Node) -> str:
         """Extract interface name from interface declaration."""
-        name_node = self._find_child_by_type(interface_node, 'identifier')
+        name_node = interface_node.child_by_field_name('name')
         if name_node:
-            return name_node.text.decode('utf8')
+            return _id(name_node)
         return "anonymous_interface"
     
     def _extract_variable_name(self, var_node: Node) -> str:
@@ -346,14 +462,14 @@ class TypeScriptParser(LanguageParser):
         # Look for variable declarator
         declarator = self._find_child_by_type(var_node, 'variable_declarator')
         if declarator:
-            name_node = self._find_child_by_type(declarator, 'identifier')
+            name_node = declarator.child_by_field_name('name')
             if name_node:
-                return name_node.text.decode('utf8')
+                return _id(name_node)
         return "anonymous_variable"
     
     def _extract_parameter_type(self, param_node: Node, content: str) -> Optional[str]:
         """Extract parameter type annotation."""
-        type_node = self._find_child_by_type(param_node, 'type_annotation')
+        type_node = param_node.child_by_field_name('type')
         if type_node:
             return self._extract_node_text(type_node, content)
         return None
@@ -361,7 +477,7 @@ class TypeScriptParser(LanguageParser):
     def _extract_return_type(self, func_node: Node, content: str) -> Optional[str]:
         """Extract function return type."""
         # Look for return type annotation
-        type_node = self._find_child_by_type(func_node, 'type_annotation')
+        type_node = func_node.child_by_field_name('return_type')
         if type_node:
             return self._extract_node_text(type_node, content)
         return None
@@ -400,7 +516,7 @@ class TypeScriptParser(LanguageParser):
                 if interface_list:
                     for child in interface_list.children:
                         if child.type == 'type_identifier':
-                            implements_interfaces.append(child.text.decode('utf8'))
+                            implements_interfaces.append(_id(child))
             
             # Extract methods, properties, and constructors
             methods = []
@@ -454,7 +570,7 @@ class TypeScriptParser(LanguageParser):
                 if interface_list:
                     for child in interface_list.children:
                         if child.type == 'type_identifier':
-                            extends_interfaces.append(child.text.decode('utf8'))
+                            extends_interfaces.append(_id(child))
             
             # Extract methods and properties
             methods = []
@@ -499,7 +615,7 @@ class TypeScriptParser(LanguageParser):
             if not name_node:
                 return None
             
-            name = name_node.text.decode('utf8')
+            name = _id(name_node)
             line_number = method_node.start_point[0] + 1
             
             # Parse function signature if it's a method
@@ -524,7 +640,7 @@ class TypeScriptParser(LanguageParser):
             modifier = self._find_child_by_type(property_node, 'accessibility_modifier')
             visibility = "public"
             if modifier:
-                visibility = modifier.text.decode('utf8')
+                visibility = _id(modifier)
             
             if visibility != "public":
                 return None
@@ -534,7 +650,7 @@ class TypeScriptParser(LanguageParser):
             if not name_node:
                 return None
             
-            name = name_node.text.decode('utf8')
+            name = _id(name_node)
             line_number = property_node.start_point[0] + 1
             
             return ExportInfo(
@@ -575,7 +691,7 @@ class TypeScriptParser(LanguageParser):
             if not name_node:
                 return None
             
-            name = name_node.text.decode('utf8')
+            name = _id(name_node)
             line_number = method_node.start_point[0] + 1
             
             # Parse function signature
@@ -600,7 +716,7 @@ class TypeScriptParser(LanguageParser):
             if not name_node:
                 return None
             
-            name = name_node.text.decode('utf8')
+            name = _id(name_node)
             line_number = property_node.start_point[0] + 1
             
             return ExportInfo(
@@ -618,81 +734,68 @@ class TypeScriptParser(LanguageParser):
         # Look for string literal in import
         string_node = self._find_child_by_type(import_node, 'string')
         if string_node:
-            return self._extract_node_text(string_node, content).strip('"\'')
+            # The string node includes its quotes at fixed positions
+            return string_node.text[1:-1].decode('utf8')
         return "unknown_source"
     
     def _extract_import_names(self, import_node: Node, content: str) -> List[str]:
         """Extract names from import statement."""
         names = []
-        
-        # Look for import specifiers
-        specifier_list = self._find_child_by_type(import_node, 'import_specifier')
-        if specifier_list:
-            for specifier in specifier_list.children:
-                if specifier.type == 'identifier':
-                    names.append(specifier.text.decode('utf8'))
-        
+
+        # Specifiers sit under import_clause/named_imports, so search the
+        # subtree and read each specifier's name field directly.
+        for specifier in self._find_nodes_by_type(import_node, 'import_specifier'):
+            name_node = specifier.child_by_field_name('name')
+            if name_node:
+                names.append(_id(name_node))
+
         return names
     
     def _extract_exports_regex(self, content: str) -> List[ExportInfo]:
         """Extract exports using regex fallback."""
-        import re
-        exports = []
-        
-        # More specific regex patterns to detect export types
-        export_patterns = [
-            (r'export\s+function\s+(\w+)', 'function'),
-            (r'export\s+class\s+(\w+)', 'class'),
-            (r'export\s+interface\s+(\w+)', 'interface'),
-            (r'export\s+(?:const|let|var)\s+(\w+)', 'variable'),
-            (r'export\s+type\s+(\w+)', 'type'),
-            (r'export\s+{\s*(\w+)(?:\s*,\s*\w+)*\s*}', 'variable'),
-            (r'export\s+default\s+(\w+)', 'variable'),
-            (r'export\s+(\w+)\s*=\s*\w+', 'variable'),
-        ]
-        
-        for pattern, export_type in export_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
-                name = match.group(1)
+        newline_offsets = _newline_offsets(content)
+
+        # Accumulate plain columns first, then build the models in bulk
+        names: List[str] = []
+        types: List[str] = []
+        line_numbers: List[int] = []
+        for match in _EXPORT_PATTERN.finditer(content):
+            group = match.lastgroup
+            if group:
+                name = match.group(group)
                 if name:
-                    # Find line number
-                    line_num = content[:match.start()].count('\n') + 1
-                    
-                    # Create export info with proper type
-                    export_info = ExportInfo(
-                        name=name,
-                        type=export_type,
-                        visibility='public',
-                        lineNumber=line_num
-                    )
-                    
-                    # Add type-specific information for classes
-                    if export_type == 'class':
-                        class_info = self.class_parser.parse_class_info(name, content, line_num)
-                        export_info.classInfo = class_info
-                    elif export_type == 'function':
-                        function_signature = self.fallback_parser.parse_function_signature(name, content, line_num)
-                        export_info.functionSignature = function_signature
-                    
-                    exports.append(export_info)
-        
+                    names.append(name)
+                    types.append(_EXPORT_GROUP_TYPES[group])
+                    line_numbers.append(bisect.bisect_left(newline_offsets, match.start()) + 1)
+
+        exports = [
+            ExportInfo(name=name, type=export_type, visibility='public', lineNumber=line_num)
+            for name, export_type, line_num in zip(names, types, line_numbers)
+        ]
+
+        # Add type-specific information only where it applies
+        for export_info in exports:
+            if export_info.type == 'class':
+                export_info.classInfo = self.class_parser.parse_class_info(
+                    export_info.name, content, export_info.lineNumber)
+            elif export_info.type == 'function':
+                export_info.functionSignature = self.fallback_parser.parse_function_signature(
+                    export_info.name, content, export_info.lineNumber)
+
         return exports
     
     def _extract_imports_regex(self, content: str) -> List[ImportInfo]:
         """Extract imports using regex fallback."""
-        import re
         imports = []
-        
-        # Simple regex pattern for import statements
-        import_pattern = r'import\s+(?:\{[^}]*\}|\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
-        matches = re.finditer(import_pattern, content, re.MULTILINE)
-        
+        newline_offsets = _newline_offsets(content)
+
+        matches = _IMPORT_PATTERN.finditer(content)
+
         for match in matches:
             source = match.group(1)
             if source:
                 # Find line number
-                line_num = content[:match.start()].count('\n') + 1
+                line_num = bisect.bisect_left(newline_offsets, match.start()) + 1
                 imports.append(ImportInfo(
                     name='import',  # Default name
                     source=source,
@@ -700,3 +803,42 @@ class TypeScriptParser(LanguageParser):
                 ))
         
         return imports
+
+
+# Per-worker parser, created once by the pool initializer so each process
+# pays the Language/Parser setup cost a single time.
+_worker_parser: Optional[TypeScriptParser] = None
+
+
+def _init_worker() -> None:
+    global _worker_parser
+    _worker_parser = TypeScriptParser()
+
+
+def _parse_one(path: str) -> ParseResult:
+    content = Path(path).read_text(encoding='utf-8', errors='ignore')
+    return _worker_parser.parse(content, file_path=path)
+
+
+def parse_many(paths: List[str]) -> List[ParseResult]:
+    """Parse many files in parallel across worker processes.
+
+    The Python-side tree walk holds the GIL, so threads cannot scale the
+    parse loop; a process pool does. Larger files are submitted first to
+    reduce tail latency. Results come back in input order.
+    """
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    order = sorted(range(len(paths)), key=lambda i: _size(paths[i]), reverse=True)
+    results: List[Optional[ParseResult]] = [None] * len(paths)
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker) as executor:
+        futures = {executor.submit(_parse_one, paths[i]): i for i in order}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+
+    return results
@@ -3,9 +3,13 @@
 Repository indexer for first-time repository processing.
 """
 
+import asyncio
+import concurrent.futures
 import logging
 import os
 import hashlib
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -13,12 +17,121 @@ from typing import List, Dict, Optional
 from src.core.database import FirestoreDatabase
 
 from .indexer import FileIndexer
-from .parser import CodeParser
+from .parser import get_code_parser
 from ..models.repository import RepositoryMetadata
 from ..models.file_index import FileIndex
 
 logger = logging.getLogger(__name__)
 
+async def _run_git(args: List[str], cwd: Optional[str] = None) -> str:
+    """
+    Run a git command without blocking the event loop.
+
+    subprocess.run inside a coroutine stalls every other task for the
+    duration of the command (minutes for a large clone); the asyncio
+    subprocess API keeps the loop free while git runs.
+
+    Args:
+        args: git arguments (without the leading 'git')
+        cwd: Optional working directory for the command
+
+    Returns:
+        Decoded stdout
+
+    Raises:
+        RuntimeError: If git exits non-zero, carrying its stderr
+    """
+    proc = await asyncio.create_subprocess_exec(
+        'git', *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode('utf-8', 'ignore').strip())
+    return stdout.decode('utf-8', 'ignore')
+
+
+def _hash_and_read(path) -> "tuple[str, str]":
+    """
+    Read a file once, streaming its bytes through the git blob SHA-1.
+
+    The digest matches `git hash-object` (SHA-1 over a "blob <len>\\0"
+    header plus the content) so every write path stores the same value
+    in fileHash: FileIndexer._get_git_file_hash computes the identical
+    digest on the commit path, and the skip-unchanged prefetch can match
+    documents regardless of which path last wrote them. Hashing the raw
+    bytes in fixed chunks still avoids the read_text + re-encode round
+    trip a separate content hash would pay.
+
+    Args:
+        path: Filesystem path to read
+
+    Returns:
+        Tuple of (decoded text, hex digest)
+    """
+    with open(path, 'rb') as f:
+        h = hashlib.sha1(
+            b"blob %d\x00" % os.fstat(f.fileno()).st_size,
+            usedforsecurity=False,
+        )
+        chunks = []
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+            chunks.append(chunk)
+    text = b''.join(chunks).decode('utf-8', 'ignore')
+    return text, h.hexdigest()
+
+
+# Extension -> language lookup; one dict probe instead of a chain of
+# str.endswith scans per file.
+_EXT2LANG = {
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.py': 'python',
+    '.go': 'go',
+    '.java': 'java',
+    '.cs': 'csharp',
+}
+
+# Hoisted membership sets: extensions we index and top-level folders we
+# descend into, shared by the walk and the changed-files filter.
+_EXTS = frozenset(_EXT2LANG)
+_ALLOWED_TOP = frozenset({'src', 'app', 'packages'})
+
+# Directories never worth descending into; pruning them at the directory
+# level avoids reading tens of thousands of entries (.git/objects alone)
+# that would only be filtered out afterwards.
+_PRUNE_DIRS = frozenset({
+    '.git', 'node_modules', 'dist', 'build', '.next', '.venv',
+    '__pycache__', '.mypy_cache', '.pytest_cache',
+})
+
+# Shared pool for the synchronous Firestore SDK, created lazily on first
+# use. One pool for the whole process: the API constructs a fresh
+# RepositoryIndexer per request, and a per-instance pool would leak its
+# non-daemon worker threads every time. The default asyncio.to_thread
+# executor caps at min(32, cpus + 4) workers, which would bottleneck
+# Firestore concurrency below the per-file concurrency on small
+# instances.
+_io_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def _get_io_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the process-wide Firestore I/O thread pool."""
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=64, thread_name_prefix='fs-io'
+                )
+    return _io_pool
+
 
 class RepositoryIndexer:
     """
@@ -35,7 +148,16 @@ class RepositoryIndexer:
         """Initialize repository indexer."""
         self.db = db
         self.file_indexer = FileIndexer(db)
-        self.parser = CodeParser()
+        self.parser = get_code_parser()
+        # Number of files processed concurrently; the per-file work is
+        # I/O-bound (disk reads + Firestore writes), so pipelining files
+        # hides the round-trip latency instead of paying it serially.
+        self.concurrency = 32
+
+    async def _run_io(self, fn, *args):
+        """Run a blocking Firestore SDK call on the shared I/O pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_io_pool(), fn, *args)
     
     async def index_repository(
         self,
@@ -79,7 +201,10 @@ class RepositoryIndexer:
             )
             
             # Store repository metadata with auto-generated UID
-            doc_ref = self.db.repositories.add(repo_metadata.model_dump())
+            doc_ref = await self._run_io(
+                self.db.repositories.add,
+                repo_metadata.model_dump(mode='python', exclude_none=True)
+            )
             repo_uid = doc_ref[1].id  # Get the auto-generated UID
             logger.info(f"Created repository metadata with UID: {repo_uid}")
             
@@ -106,7 +231,7 @@ class RepositoryIndexer:
             
             # Get the document reference using the UID
             repo_ref = self.db.repositories.document(repo_uid)
-            repo_ref.update(final_status)
+            await self._run_io(repo_ref.update, final_status)
             logger.info(f"Repository indexing completed: {repo_url} (UID: {repo_uid})")
             
             return {
@@ -123,7 +248,7 @@ class RepositoryIndexer:
             # Update repository status to failed if we have a UID
             if 'repo_uid' in locals():
                 repo_ref = self.db.repositories.document(repo_uid)
-                repo_ref.update({
+                await self._run_io(repo_ref.update, {
                     "status": "failed",
                     "lastUpdated": datetime.utcnow().isoformat() + 'Z',
                     "errorMessage": str(e)
@@ -140,29 +265,84 @@ class RepositoryIndexer:
         Returns:
             List of file paths relative to repository root
         """
-        repo_path_obj = Path(repo_path)
-        files = []
-        
-        # File extensions to process
-        extensions = {'.ts', '.js', '.tsx', '.jsx', '.py', '.go', '.java', '.cs'}
-        
-        # Only process files in specific folders or root
-        allowed_folders = {'src', 'app', 'packages'}
-        
-        for file_path in repo_path_obj.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in extensions:
-                # Get relative path from repository root
-                relative_path = str(file_path.relative_to(repo_path_obj))
-                
-                # Check if file is in one of the allowed folders or in root
-                path_parts = Path(relative_path).parts
-                if len(path_parts) == 1 or path_parts[0] in allowed_folders:
-                    files.append(relative_path)
-        
-        # Sort files for consistent processing order
-        files.sort()
+        files: List[str] = []
+
+        def _scandir_rec(dirpath: str, rel: str, top_level: bool) -> None:
+            # os.scandir reuses the file-type bits from readdir, so
+            # is_dir/is_file below don't stat() every entry the way
+            # Path.rglob + is_file() does.
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in _PRUNE_DIRS:
+                            continue
+                        # Prune at the top level: only allowed folders are
+                        # ever entered, so we never descend into .git,
+                        # node_modules, etc.
+                        if top_level and entry.name not in _ALLOWED_TOP:
+                            continue
+                        _scandir_rec(entry.path, rel + entry.name + '/', False)
+                    elif entry.is_file(follow_symlinks=False):
+                        dot = entry.name.rfind('.')
+                        if dot >= 0 and entry.name[dot:].lower() in _EXTS:
+                            files.append(rel + entry.name)
+
+        _scandir_rec(repo_path, '', True)
+
+        # Group same-language files together so parser state stays hot
+        # across consecutive files; path as tiebreaker keeps the order
+        # deterministic for logs and reruns
+        files.sort(
+            key=lambda p: (_EXT2LANG.get(os.path.splitext(p)[1].lower(), 'text'), p)
+        )
         return files
     
+    async def _changed_files(self, repo_path: str, old_sha: str, new_sha: str):
+        """
+        Yield files changed between two commits that we would index.
+
+        Asks git for the added/modified/renamed paths between the SHAs,
+        which is O(changed files) rather than O(tree) like a full walk,
+        and filters by extension and allowed folder in-memory.
+
+        Args:
+            repo_path: Path to cloned repository
+            old_sha: Previously processed commit SHA
+            new_sha: Newly cloned commit SHA
+
+        Yields:
+            Relative file paths (strings) that need reindexing
+        """
+        proc = await asyncio.create_subprocess_exec(
+            'git', '-C', repo_path, 'diff', '--name-only', '--diff-filter=AMR',
+            f'{old_sha}..{new_sha}',
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert proc.stdout is not None
+        while True:
+            raw = await proc.stdout.readline()
+            if not raw:
+                break
+            line = raw.decode('utf-8', 'ignore').rstrip('\n')
+            if not line:
+                continue
+            # Extension filter via the language table; prefix filter on
+            # the raw string avoids Path construction per line
+            dot = line.rfind('.')
+            if dot < 0 or line[dot:].lower() not in _EXT2LANG:
+                continue
+            slash = line.find('/')
+            if slash == -1 or line[:slash] in _ALLOWED_TOP:
+                yield line
+
+        await proc.wait()
+        if proc.returncode != 0:
+            stderr = (await proc.stderr.read()).decode('utf-8', 'ignore') if proc.stderr else ''
+            raise RuntimeError(f"git diff failed: {stderr}")
+
     async def _process_repository_files(
         self,
         repo_url: str,
@@ -184,111 +364,187 @@ class RepositoryIndexer:
         Returns:
             Dictionary with processing results
         """
-        processed = 0
-        failed = 0
-        skipped = 0
-        
-        for file_path in file_paths:
+        # Coalesce the per-file index writes into batched RPCs instead of
+        # one round trip per document. The BulkWriter flushes its own
+        # batches from a thread pool; the final flush happens off the
+        # event loop below.
+        bulk_writer = self.db.client.bulk_writer()
+
+        # Bounded prefetch queue: a producer reads file contents ahead of
+        # the indexing workers so disk I/O overlaps the Firestore I/O
+        # instead of serializing with it.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        counts = {"processed": 0, "failed": 0, "skipped": 0}
+        start = time.monotonic()
+
+        def _tick() -> None:
+            # Per-file info logging costs lock acquisition plus record
+            # formatting thousands of times per repo; one aggregate line
+            # every 100 files keeps the signal without the overhead
+            done = counts["processed"] + counts["failed"] + counts["skipped"]
+            if done % 100 == 0:
+                rate = done / (time.monotonic() - start or 1e-9)
+                logger.info(
+                    "processed=%d failed=%d skipped=%d rate=%.1f/s",
+                    counts["processed"], counts["failed"], counts["skipped"], rate
+                )
+
+        # Fetch any existing index hashes in one multi-get so re-runs
+        # (e.g. after a partial failure) can skip unchanged files before
+        # parsing or writing anything
+        stored_hashes: Dict[str, str] = {}
+        if file_paths:
+            refs = [
+                self.db.file_indexes.document(f"{repo_url}_{p.replace('/', '_')}")
+                for p in file_paths
+            ]
             try:
-                logger.info(f"Processing file: {file_path}")
-                
-                # Read file content
-                full_path = Path(repo_path) / file_path
-                if not full_path.exists():
-                    logger.warning(f"File not found: {file_path}")
-                    failed += 1
-                    continue
-                
-                file_content = full_path.read_text(encoding='utf-8', errors='ignore')
-                
-                # Determine language from file extension
-                language = self._get_language_from_path(file_path)
-                
-                # Process the file using FileIndexer
-                success = await self.file_indexer.process_file(
-                    repo_url=repo_url,
-                    file_path=file_path,
-                    commit_sha=commit_sha,
-                    file_timestamp=commit_timestamp,
-                    file_content=file_content,
-                    language=language
-                    # exports and imports will be parsed automatically by FileIndexer
+                snapshots = await self._run_io(
+                    lambda: list(self.db.client.get_all(refs))
                 )
-                
-                if success:
-                    processed += 1
-                    logger.info(f"Successfully processed: {file_path}")
-                else:
-                    failed += 1
-                    logger.warning(f"Failed to process: {file_path}")
-                    
+                path_by_ref = {r.path: p for r, p in zip(refs, file_paths)}
+                for snap in snapshots:
+                    if snap.exists:
+                        data = snap.to_dict() or {}
+                        stored = data.get('fileHash')
+                        if stored:
+                            stored_hashes[path_by_ref[snap.reference.path]] = stored
             except Exception as e:
-                logger.error(f"Error processing file {file_path}: {e}")
-                failed += 1
-        
+                # Worst case we just reprocess everything
+                logger.warning(f"Could not prefetch existing file hashes: {e}")
+
+        async def _prefetch() -> None:
+            for file_path in file_paths:
+                try:
+                    full_path = Path(repo_path) / file_path
+                    if not full_path.exists():
+                        logger.warning(f"File not found: {file_path}")
+                        counts["failed"] += 1
+                        _tick()
+                        continue
+
+                    # Read and hash in one pass, off the event loop so the
+                    # queue fills while workers are awaiting Firestore
+                    file_content, file_hash = await asyncio.to_thread(
+                        _hash_and_read, full_path
+                    )
+                except Exception as e:
+                    logger.error(f"Error reading file {file_path}: {e}")
+                    counts["failed"] += 1
+                    _tick()
+                    continue
+
+                # Unchanged since the stored index: nothing to parse or write
+                if stored_hashes.get(file_path) == file_hash:
+                    logger.debug(f"Skipping unchanged file: {file_path}")
+                    counts["skipped"] += 1
+                    _tick()
+                    continue
+
+                await queue.put((file_path, file_content, file_hash))
+
+            # One sentinel per worker to shut them down
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def _worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                file_path, file_content, file_hash = item
+                try:
+                    logger.debug(f"Processing file: {file_path}")
+
+                    # Determine language from file extension
+                    language = self._get_language_from_path(file_path)
+
+                    # Process the file using FileIndexer
+                    success = await self.file_indexer.process_file(
+                        repo_url=repo_url,
+                        file_path=file_path,
+                        commit_sha=commit_sha,
+                        file_timestamp=commit_timestamp,
+                        file_content=file_content,
+                        language=language,
+                        # exports and imports will be parsed automatically by FileIndexer
+                        file_hash=file_hash,
+                        bulk_writer=bulk_writer
+                    )
+
+                    if success:
+                        logger.debug(f"Successfully processed: {file_path}")
+                        counts["processed"] += 1
+                    else:
+                        logger.warning(f"Failed to process: {file_path}")
+                        counts["failed"] += 1
+                except Exception as e:
+                    logger.error(f"Error processing file {file_path}: {e}")
+                    counts["failed"] += 1
+                _tick()
+
+        workers = [asyncio.create_task(_worker()) for _ in range(self.concurrency)]
+        await asyncio.gather(_prefetch(), *workers)
+
+        # Drain any writes still queued in the BulkWriter; flush() blocks,
+        # so run it on the I/O pool
+        await self._run_io(bulk_writer.flush)
+
         return {
-            "processed": processed,
-            "failed": failed,
-            "skipped": skipped
+            "processed": counts["processed"],
+            "failed": counts["failed"],
+            "skipped": counts["skipped"]
         }
     
     def _get_language_from_path(self, file_path: str) -> str:
         """Determine language from file path."""
-        if file_path.endswith(".ts"):
-            return "typescript"
-        elif file_path.endswith(".js"):
-            return "javascript"
-        elif file_path.endswith(".tsx"):
-            return "typescript"
-        elif file_path.endswith(".jsx"):
-            return "javascript"
-        elif file_path.endswith(".py"):
-            return "python"
-        elif file_path.endswith(".go"):
-            return "go"
-        elif file_path.endswith(".java"):
-            return "java"
-        elif file_path.endswith(".cs"):
-            return "csharp"
-        else:
-            return "text"
+        return _EXT2LANG.get(os.path.splitext(file_path)[1].lower(), "text")
     
-    async def _clone_repository(self, repo_url: str, branch: str = "main") -> str:
+    async def _clone_repository(self, repo_url: str, branch: str = "main", sparse: bool = True) -> str:
         """
         Clone repository to temporary directory.
-        
+
         Args:
             repo_url: Repository URL to clone
             branch: Branch to clone (defaults to 'main')
-            
+            sparse: Use a shallow, blobless, sparse clone limited to the
+                allowed folders (src/app/packages plus root files). Pass
+                False to fall back to a full single-branch clone for repos
+                that keep source elsewhere
+
         Returns:
             Path to temporary directory containing cloned repository
         """
         import tempfile
-        import subprocess
-        
+
         # Create temporary directory
         temp_dir = tempfile.mkdtemp(prefix="repo_index_")
         logger.info(f"Created temporary directory: {temp_dir}")
-        
+
         try:
-            # Clone repository with specific branch
-            logger.info(f"Cloning repository: {repo_url} (branch: {branch})")
-            result = subprocess.run(
-                ["git", "clone", "--branch", branch, "--single-branch", repo_url, temp_dir],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            # Clone repository with specific branch. Indexing only reads
+            # the current tree of a few directories, so the sparse path
+            # fetches a depth-1, blobless clone and then materializes just
+            # the allowed folders -- a fraction of the bytes of a full
+            # branch clone.
+            logger.info(f"Cloning repository: {repo_url} (branch: {branch}, sparse: {sparse})")
+            if sparse:
+                await _run_git(["clone", "--depth", "1", "--filter=blob:none", "--sparse",
+                                "--branch", branch, "--single-branch", repo_url, temp_dir])
+                # Cone-mode sparse-checkout keeps root-level files, so the
+                # root-file handling in _get_repository_files still works
+                await _run_git(["-C", temp_dir, "sparse-checkout", "set", "src", "app", "packages"])
+            else:
+                await _run_git(["clone", "--branch", branch, "--single-branch", repo_url, temp_dir])
             logger.info(f"Repository cloned successfully to: {temp_dir}")
             return temp_dir
-            
-        except subprocess.CalledProcessError as e:
+
+        except RuntimeError as e:
             # Clean up temp directory if cloning failed
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
-            logger.error(f"Failed to clone repository: {e.stderr}")
-            raise RuntimeError(f"Failed to clone repository: {e.stderr}")
+            logger.error(f"Failed to clone repository: {e}")
+            raise RuntimeError(f"Failed to clone repository: {e}")
     
     async def _cleanup_temp_directory(self, temp_dir: str):
         """
@@ -315,45 +571,22 @@ class RepositoryIndexer:
         Returns:
             Dictionary with commit SHA, timestamp, and repository name
         """
-        import subprocess
-        import os
-        
         try:
-            # Change to repository directory
-            original_cwd = os.getcwd()
-            os.chdir(repo_path)
-            
-            try:
-                # Get latest commit SHA
-                commit_result = subprocess.run(
-                    ["git", "log", "-1", "--format=%H"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                commit_sha = commit_result.stdout.strip()
-                
-                # Get commit timestamp
-                timestamp_result = subprocess.run(
-                    ["git", "log", "-1", "--format=%aI"],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                commit_timestamp = timestamp_result.stdout.strip()
-                
-                return {
-                    "sha": commit_sha,
-                    "timestamp": commit_timestamp
-                }
-                
-            finally:
-                # Restore original working directory
-                os.chdir(original_cwd)
-                
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to get commit info: {e.stderr}")
-            raise RuntimeError(f"Failed to get commit info: {e.stderr}")
+            # One git invocation for both fields; the NUL separator can't
+            # collide with either format. cwd= avoids mutating the
+            # process-wide working directory, which would race with any
+            # concurrent indexing.
+            stdout = await _run_git(["log", "-1", "--format=%H%x00%aI"], cwd=repo_path)
+            commit_sha, _, commit_timestamp = stdout.strip().partition('\x00')
+
+            return {
+                "sha": commit_sha,
+                "timestamp": commit_timestamp
+            }
+
+        except RuntimeError as e:
+            logger.error(f"Failed to get commit info: {e}")
+            raise RuntimeError(f"Failed to get commit info: {e}")
         except Exception as e:
             logger.error(f"Error getting commit info: {e}")
             raise
@@ -12,9 +12,9 @@ import asyncio
 import logging
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -22,7 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.core.config import get_settings
 from src.core.database import FirestoreDatabase
 from src.core.indexer import FileIndexer
-from src.core.parser import CodeParser
+from src.core.parser import get_code_parser
 from src.core.locks import DistributedLockManager
 
 # Configure logging
@@ -33,6 +33,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
 class RepositoryProcessor:
     """Processes entire repositories for code indexing."""
     
@@ -41,13 +46,18 @@ class RepositoryProcessor:
         self.settings = get_settings()
         self.db = FirestoreDatabase()
         self.indexer = FileIndexer(self.db)
-        self.parser = CodeParser()
+        self.parser = get_code_parser()
         self.lock_manager = DistributedLockManager()
         
         # Job configuration
         self.batch_size = 50  # Process files in batches
         self.max_retries = 3
         self.retry_delay = 5  # seconds
+        # First-time indexing of a fresh clone has a single writer, so one
+        # repo-scoped lock suffices. Set True only when multiple
+        # processors may write the same repo concurrently; it restores
+        # per-file locks at the cost of two Firestore RTTs per file.
+        self.concurrent_writers = False
         
     async def process_repository(
         self, 
@@ -64,13 +74,21 @@ class RepositoryProcessor:
         Returns:
             True if processing completed successfully, False otherwise
         """
+        # One repo-scoped lock for the whole run instead of a
+        # Firestore-backed lock per file
+        repo_lock_key = f"repo:{repo_url}"
+        lock_acquired = await self.lock_manager.acquire_lock(repo_lock_key, timeout=30)
+        if not lock_acquired:
+            logger.error(f"Could not acquire repository lock for {repo_url}")
+            return False
+
         try:
             logger.info(f"Starting repository processing: {repo_url}")
-            
+
             # Update repository status
             await self.db.update_repository(repo_url, {
                 "status": "processing",
-                "lastUpdated": datetime.utcnow().isoformat() + "Z"
+                "lastUpdated": _iso_now()
             })
             
             # Get repository metadata
@@ -79,47 +97,69 @@ class RepositoryProcessor:
                 logger.error(f"Repository not found: {repo_url}")
                 return False
             
-            # Get list of files to process
-            files_to_process = await self._get_files_to_process(repo_url, force_reprocess)
-            
-            if not files_to_process:
+            # Process files through a bounded worker pool, consuming paths
+            # as _get_files_to_process discovers them -- the first file
+            # starts indexing without waiting for the full listing. The
+            # workers keep Firestore saturated while a background task
+            # reports progress periodically; totals track files seen so
+            # far since the full count isn't known up-front.
+            counters = {"successful": 0, "failed": 0, "seen": 0}
+
+            queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+
+            async def _feed():
+                async for file_path in self._get_files_to_process(repo_url, force_reprocess):
+                    counters["seen"] += 1
+                    await queue.put(file_path)
+                # One sentinel per worker to shut them down
+                for _ in range(self.batch_size):
+                    await queue.put(None)
+
+            async def _worker():
+                while True:
+                    file_path = await queue.get()
+                    if file_path is None:
+                        return
+                    if await self._process_path(repo_url, file_path):
+                        counters["successful"] += 1
+                    else:
+                        counters["failed"] += 1
+
+            async def _report_progress():
+                # Decouple progress writes from worker throughput: one
+                # Firestore update every 2s instead of one per batch
+                while True:
+                    await asyncio.sleep(2)
+                    await self._update_repository_progress(
+                        repo_url,
+                        counters["successful"],
+                        counters["seen"],
+                        counters["failed"]
+                    )
+
+            reporter = asyncio.create_task(_report_progress())
+            try:
+                await asyncio.gather(_feed(), *[_worker() for _ in range(self.batch_size)])
+            finally:
+                reporter.cancel()
+
+            total_files = counters["seen"]
+            processed_files = counters["successful"]
+            failed_files = counters["failed"]
+
+            if total_files == 0:
                 logger.info(f"No files to process for repository: {repo_url}")
                 await self._mark_repository_complete(repo_url, repo_metadata)
                 return True
-            
-            logger.info(f"Processing {len(files_to_process)} files for repository: {repo_url}")
-            
-            # Process files in batches
-            total_files = len(files_to_process)
-            processed_files = 0
-            failed_files = 0
-            
-            for i in range(0, total_files, self.batch_size):
-                batch = files_to_process[i:i + self.batch_size]
-                batch_start = i + 1
-                batch_end = min(i + self.batch_size, total_files)
-                
-                logger.info(f"Processing batch {batch_start}-{batch_end} of {total_files}")
-                
-                # Process batch
-                batch_results = await self._process_file_batch(repo_url, batch)
-                
-                # Update progress
-                processed_files += batch_results["successful"]
-                failed_files += batch_results["failed"]
-                
-                # Update repository progress
-                await self._update_repository_progress(
-                    repo_url, 
-                    processed_files, 
-                    total_files, 
-                    failed_files
-                )
-                
-                # Small delay between batches to avoid overwhelming the system
-                if i + self.batch_size < total_files:
-                    await asyncio.sleep(1)
-            
+
+            # Final progress update with the complete tallies
+            await self._update_repository_progress(
+                repo_url,
+                processed_files,
+                total_files,
+                failed_files
+            )
+
             # Mark repository as complete
             await self._mark_repository_complete(repo_url, repo_metadata)
             
@@ -132,20 +172,27 @@ class RepositoryProcessor:
             logger.error(f"Error processing repository {repo_url}: {e}")
             await self._mark_repository_failed(repo_url, str(e))
             return False
+
+        finally:
+            await self.lock_manager.release_lock(repo_lock_key)
     
     async def _get_files_to_process(
-        self, 
-        repo_url: str, 
+        self,
+        repo_url: str,
         force_reprocess: bool
-    ) -> List[str]:
-        """Get list of files that need processing."""
+    ) -> AsyncIterator[str]:
+        """Yield files that need processing as they are discovered.
+
+        Streaming lets the workers start on the first file immediately
+        instead of waiting for the full listing to materialize.
+        """
         try:
             # This would typically involve:
             # 1. Cloning the repository
             # 2. Scanning for supported file types
             # 3. Checking which files have changed (unless force_reprocess)
-            
-            # For now, return a mock list - in production this would be dynamic
+
+            # For now, yield a mock list - in production this would be dynamic
             # based on the actual repository content
             # Only include files in allowed folders: src, app, packages, or root
             mock_files = [
@@ -156,22 +203,31 @@ class RepositoryProcessor:
                 "package.json",  # root file
                 "tsconfig.json"  # root file
             ]
-            
+
             if force_reprocess:
-                return mock_files
-            
-            # Check which files actually need processing
-            files_to_process = []
-            for file_path in mock_files:
-                existing_index = await self.db.get_file_index(repo_url, file_path)
-                if not existing_index:
-                    files_to_process.append(file_path)
-            
-            return files_to_process
-            
+                for file_path in mock_files:
+                    yield file_path
+                return
+
+            # Check which files actually need processing with a single
+            # batched multi-get instead of one Firestore read per file
+            refs = [
+                self.db.file_indexes.document(f"{repo_url}_{p.replace('/', '_')}")
+                for p in mock_files
+            ]
+            snapshots = await asyncio.to_thread(
+                lambda: list(self.db.client.get_all(refs))
+            )
+            exists_by_path = {
+                snap.reference.path: snap.exists for snap in snapshots
+            }
+            for file_path, ref in zip(mock_files, refs):
+                if not exists_by_path.get(ref.path, False):
+                    yield file_path
+
         except Exception as e:
             logger.error(f"Error getting files to process: {e}")
-            return []
+            return
     
     async def _process_file_batch(
         self, 
@@ -181,32 +237,43 @@ class RepositoryProcessor:
         """Process a batch of files."""
         successful = 0
         failed = 0
-        
+
         for file_path in file_paths:
-            try:
-                # Acquire file lock
+            if await self._process_path(repo_url, file_path):
+                successful += 1
+            else:
+                failed += 1
+
+        return {"successful": successful, "failed": failed}
+
+    async def _process_path(self, repo_url: str, file_path: str) -> bool:
+        """Process one file, honoring the optional per-file lock."""
+        try:
+            if self.concurrent_writers:
+                # Opt-in per-file lock for multi-writer deployments
                 lock_key = f"{repo_url}:{file_path}"
                 lock_acquired = await self.lock_manager.acquire_lock(lock_key, timeout=30)
-                
+
                 if not lock_acquired:
                     logger.warning(f"Could not acquire lock for {file_path}")
-                    failed += 1
-                    continue
-                
+                    return False
+
                 try:
-                    # Process the file
                     await self._process_single_file(repo_url, file_path)
-                    successful += 1
-                    
+                    return True
+
                 finally:
                     # Always release the lock
                     await self.lock_manager.release_lock(lock_key)
-                    
-            except Exception as e:
-                logger.error(f"Error processing file {file_path}: {e}")
-                failed += 1
-        
-        return {"successful": successful, "failed": failed}
+            else:
+                # The repo-scoped lock taken in process_repository
+                # already excludes other writers
+                await self._process_single_file(repo_url, file_path)
+                return True
+
+        except Exception as e:
+            logger.error(f"Error processing file {file_path}: {e}")
+            return False
     
     async def _process_single_file(self, repo_url: str, file_path: str):
         """Process a single file for indexing."""
@@ -217,22 +284,24 @@ class RepositoryProcessor:
             # 3. Indexing with FileIndexer
             # 4. Storing results in Firestore
             
-            # Mock processing for now
-            logger.info(f"Processing file: {file_path}")
+            # Mock processing for now; per-file detail stays at debug so
+            # large repos don't pay a log write per file
+            logger.debug(f"Processing file: {file_path}")
             
             # Simulate processing time
             await asyncio.sleep(0.1)
             
-            # Create mock file index
+            # Create mock file index; one timestamp per file, not one per field
+            now = _iso_now()
             mock_index = {
                 "repoId": repo_url,
                 "filePath": file_path,
                 "fileHash": f"mock_hash_{file_path}",
                 "lastCommitSHA": "mock_commit_sha",
-                "lastCommitTimestamp": datetime.utcnow().isoformat() + "Z",
+                "lastCommitTimestamp": now,
                 "exports": [],
                 "imports": [],
-                "updatedAt": datetime.utcnow().isoformat() + "Z",
+                "updatedAt": now,
                 "language": "python",
                 "parseErrors": []
             }
@@ -258,7 +327,7 @@ class RepositoryProcessor:
                 "totalFiles": total,
                 "failedFiles": failed,
                 "progressPercentage": int((processed / total) * 100) if total > 0 else 0,
-                "lastUpdated": datetime.utcnow().isoformat() + "Z"
+                "lastUpdated": _iso_now()
             }
             
             await self.db.update_repository(repo_url, progress)
@@ -269,11 +338,12 @@ class RepositoryProcessor:
     async def _mark_repository_complete(self, repo_url: str, repo_metadata):
         """Mark repository as successfully processed."""
         try:
+            now = _iso_now()
             await self.db.update_repository(repo_url, {
                 "status": "completed",
-                "lastUpdated": datetime.utcnow().isoformat() + "Z",
+                "lastUpdated": now,
                 "lastProcessedCommit": "mock_commit_sha",
-                "lastProcessedCommitTimestamp": datetime.utcnow().isoformat() + "Z"
+                "lastProcessedCommitTimestamp": now
             })
             
         except Exception as e:
@@ -284,7 +354,7 @@ class RepositoryProcessor:
         try:
             await self.db.update_repository(repo_url, {
                 "status": "failed",
-                "lastUpdated": datetime.utcnow().isoformat() + "Z",
+                "lastUpdated": _iso_now(),
                 "errorMessage": error_message
             })
             
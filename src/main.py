@@ -2,53 +2,79 @@
 Main FastAPI application entry point for the Serverless Code Index System.
 """
 
+import asyncio
+import hashlib
 import logging
 import sys
+import time
 from contextlib import asynccontextmanager
+from email.utils import formatdate
 from typing import Dict, Any
-from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 # Add src to path for direct execution
 if __name__ == "__main__":
     src_path = Path(__file__).parent
     if str(src_path) not in sys.path:
         sys.path.insert(0, str(src_path))
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # Use absolute imports for direct execution, relative for module import
 try:
-    from .api.health import router as health_router
-    from .api.files import router as files_router
-    from .api.repositories import router as repositories_router
-    from .core.locks import FileLock
-    from .core.indexer import FileIndexer
     from .core.config import get_settings
     from .core.database import get_database
     from .core.cloud_run_jobs import get_jobs_service
 except ImportError:
     # Fallback to absolute imports for direct execution
-    from api.health import router as health_router
-    from api.files import router as files_router
-    from api.repositories import router as repositories_router
-    from core.locks import FileLock
-    from core.indexer import FileIndexer
     from core.config import get_settings
     from core.database import get_database
     from core.cloud_run_jobs import get_jobs_service
 
+
+class _JsonLogFormatter(logging.Formatter):
+    """Emit one JSON object per log line for Cloud Run's stdout pipeline.
+
+    Cloud Logging ingests JSON natively, so structured lines skip the
+    regex parse the plain-text format pays per record, and orjson keeps
+    the serialization off the Python hot path.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(_JsonLogFormatter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
 
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with a Z suffix.
+
+    time.gmtime/strftime avoids datetime's tzinfo machinery, which the
+    status and error paths would otherwise pay on every response.
+    """
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int((t % 1) * 1000):03d}Z"
+
+
 class HealthStatus(BaseModel):
     """Health status response model."""
     status: str
@@ -57,41 +83,65 @@ class HealthStatus(BaseModel):
     uptime: float
 
 
+# Readiness flag set once the background client warm-up finishes, so
+# /readyz can answer without touching GCP on every probe
+_ready = asyncio.Event()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("Starting Serverless Code Index System...")
     
+    async def _warm_clients():
+        # Build the GCP-backed services concurrently - each spends most
+        # of its time in network/credential setup and neither depends on
+        # the other, so this pays only the slower of the two instead of
+        # their sum. Either might fail without proper GCP setup.
+        db_result, jobs_result = await asyncio.gather(
+            asyncio.to_thread(get_database),
+            asyncio.to_thread(get_jobs_service),
+            return_exceptions=True
+        )
+
+        if isinstance(db_result, Exception):
+            logger.warning("Database initialization failed (continuing anyway): %s", db_result)
+        else:
+            logger.info("Database connection initialized")
+
+        if isinstance(jobs_result, Exception):
+            logger.warning("Cloud Run Jobs initialization failed (continuing anyway): %s", jobs_result)
+        else:
+            logger.info("Cloud Run Jobs service initialized")
+
+        # Warm-up attempted for both clients (even if degraded) - the
+        # instance is as ready as it is going to get
+        _ready.set()
+
+    warmup = None
     try:
         # Initialize configuration
         settings = get_settings()
-        logger.info(f"Configuration loaded for project: {settings.gcp_project_id}")
-        
-        # Initialize database connection - this might fail without proper GCP setup
-        try:
-            db = get_database()
-            logger.info("Database connection initialized")
-        except Exception as db_error:
-            logger.warning(f"Database initialization failed (continuing anyway): {db_error}")
-        
-        # Initialize Cloud Run Jobs service - this might fail without proper GCP setup
-        try:
-            jobs_service = get_jobs_service()
-            logger.info("Cloud Run Jobs service initialized")
-        except Exception as jobs_error:
-            logger.warning(f"Cloud Run Jobs initialization failed (continuing anyway): {jobs_error}")
-        
+        logger.info("Configuration loaded for project: %s", settings.gcp_project_id)
+
+        # The database and jobs singletons are lazy (routes resolve them
+        # via Depends), so startup doesn't need to block on them; warm
+        # them in the background and let /health answer immediately.
+        warmup = asyncio.create_task(_warm_clients())
+
         logger.info("Application startup completed")
-        
+
     except Exception as e:
-        logger.error(f"Critical error during startup: {e}")
+        logger.error("Critical error during startup: %s", e)
         logger.warning("Continuing with limited functionality...")
         # Don't raise the exception - continue with limited functionality
-    
+
     yield
-    
+
     # Shutdown
+    if warmup is not None:
+        warmup.cancel()
     logger.info("Shutting down Serverless Code Index System...")
 
 
@@ -102,12 +152,29 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+class FastCORS(CORSMiddleware):
+    """CORSMiddleware with O(1) origin membership checks.
+
+    Starlette scans the allow_origins list per request; with a static
+    origin list a frozenset lookup answers in constant time.
+    """
+
+    def __init__(self, app, allow_origins=(), **kwargs):
+        super().__init__(app, allow_origins=list(allow_origins), **kwargs)
+        self._origin_set = frozenset(allow_origins)
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return self.allow_all_origins or origin in self._origin_set
+
+
+# Add CORS middleware; get_settings() is lru_cached, so this reuses the
+# Settings instance lifespan reads rather than re-parsing the environment
 app.add_middleware(
-    CORSMiddleware,
+    FastCORS,
     allow_origins=get_settings().cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
@@ -115,48 +182,112 @@ app.add_middleware(
 )
 
 
-# Include routers
-app.include_router(health_router, prefix="/health", tags=["health"])
-app.include_router(files_router, prefix="/files", tags=["files"])
-app.include_router(repositories_router, prefix="/repositories", tags=["repositories"])
+def _register_routes(app: FastAPI) -> None:
+    """Import and mount the API routers.
+
+    Routes must exist before the app serves, so this runs at import time
+    right below; the function only keeps the router imports next to their
+    include_router calls instead of scattered through module scope.
+    """
+    try:
+        from .api.health import router as health_router
+        from .api.files import router as files_router
+        from .api.repositories import router as repositories_router
+    except ImportError:
+        from api.health import router as health_router
+        from api.files import router as files_router
+        from api.repositories import router as repositories_router
+
+    app.include_router(health_router, prefix="/health", tags=["health"])
+    app.include_router(files_router, prefix="/files", tags=["files"])
+    app.include_router(repositories_router, prefix="/repositories", tags=["repositories"])
+
+
+_register_routes(app)
+
+
+# The root body never changes at runtime, so precompute it together
+# with a strong ETag and let conditional requests short-circuit to 304
+_ROOT_BODY = {
+    "name": "Serverless Code Index System",
+    "version": "0.1.0",
+    "description": "A serverless backend that tracks exported/imported variables across files in git repositories",
+    "docs": "/docs",
+    "health": "/health",
+    "status": "operational",
+}
+_ROOT_ETAG = f'"{hashlib.blake2b(orjson.dumps(_ROOT_BODY), digest_size=8).hexdigest()}"'
+_ROOT_HEADERS = {"ETag": _ROOT_ETAG, "Cache-Control": "public, max-age=3600"}
+
+
+# Liveness and readiness are split so Cloud Run probes stop funnelling
+# through /status: /livez is a static 200 with no allocations to speak
+# of, and /readyz only consults the local warm-up flag - neither makes
+# a GCP call.
+@app.get("/livez", tags=["health"], include_in_schema=False)
+async def livez() -> Response:
+    """Liveness probe: the process is up and serving."""
+    return Response(content=b"ok", media_type="text/plain")
+
+
+@app.get("/readyz", tags=["health"], include_in_schema=False)
+async def readyz() -> Response:
+    """Readiness probe: client warm-up has completed."""
+    if _ready.is_set():
+        return Response(content=b"ok", media_type="text/plain")
+    return Response(content=b"warming up", media_type="text/plain", status_code=503)
 
 
 @app.get("/", tags=["root"])
-async def root() -> Dict[str, Any]:
+async def root(request: Request) -> Response:
     """Root endpoint with system information."""
-    # Debug breakpoint - the debugger will stop here
-    debug_info = "Debugger test - this line will be hit when debugging"
-    
-    # Uncomment the next line to test with pdb
-    # import pdb; pdb.set_trace()
-    
+    if request.headers.get("if-none-match") == _ROOT_ETAG:
+        return Response(status_code=304, headers=_ROOT_HEADERS)
+    return ORJSONResponse(content=_ROOT_BODY, headers=_ROOT_HEADERS)
+
+
+# Short-TTL cache for /status: liveness probes can hammer the endpoint,
+# and each uncached hit costs GCP round trips. The lock collapses a
+# stampede of cache misses into a single refresh.
+_STATUS_TTL = 5.0
+_STATUS_CACHE_CONTROL = f"max-age={int(_STATUS_TTL)}"
+_status_cache = None  # (monotonic timestamp, body, headers)
+_status_lock = asyncio.Lock()
+
+
+def _status_headers() -> Dict[str, str]:
+    """Response headers for a freshly built /status body."""
     return {
-        "name": "Serverless Code Index System",
-        "version": "0.1.0",
-        "description": "A serverless backend that tracks exported/imported variables across files in git repositories",
-        "docs": "/docs",
-        "health": "/health",
-        "status": "operational",
-        "debug": debug_info
+        "Cache-Control": _STATUS_CACHE_CONTROL,
+        # Tie Last-Modified to the cache epoch so clients can revalidate
+        "Last-Modified": formatdate(usegmt=True),
     }
 
 
-@app.get("/status", tags=["status"])
-async def status() -> Dict[str, Any]:
-    """System status endpoint."""
+async def _build_status() -> Dict[str, Any]:
+    """Build the /status body by querying the backing services."""
     try:
-        # Get database stats
         db = get_database()
-        db_stats = await db.get_database_stats()
-        
-        # Get jobs info
         jobs_service = get_jobs_service()
-        jobs_info = await jobs_service.get_job_info("system-status")
-        
+
+        # Fetch both service views concurrently; a failure in one
+        # degrades that service instead of the whole endpoint
+        db_stats, jobs_info = await asyncio.gather(
+            db.get_database_stats(),
+            jobs_service.get_job_info("system-status"),
+            return_exceptions=True
+        )
+        if isinstance(db_stats, BaseException):
+            logger.error("Error getting database stats: %s", db_stats)
+            db_stats = {"error": str(db_stats)}
+        if isinstance(jobs_info, BaseException):
+            logger.error("Error getting jobs info: %s", jobs_info)
+            jobs_info = {"error": str(jobs_info)}
+
         return {
             "status": "operational",
             "version": "0.1.0",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _now_iso(),
             "services": {
                 "api": "operational",
                 "database": "operational" if "error" not in db_stats else "degraded",
@@ -166,11 +297,11 @@ async def status() -> Dict[str, Any]:
             "jobs_info": jobs_info
         }
     except Exception as e:
-        logger.error(f"Error getting system status: {e}")
+        logger.error("Error getting system status: %s", e)
         return {
             "status": "degraded",
             "version": "0.1.0",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _now_iso(),
             "services": {
                 "api": "operational",
                 "database": "degraded",
@@ -180,16 +311,37 @@ async def status() -> Dict[str, Any]:
         }
 
 
+@app.get("/status", tags=["status"])
+async def status() -> ORJSONResponse:
+    """System status endpoint (cached for a few seconds)."""
+    global _status_cache
+
+    cached = _status_cache
+    if cached is not None and time.monotonic() - cached[0] < _STATUS_TTL:
+        return ORJSONResponse(content=cached[1], headers=cached[2])
+
+    async with _status_lock:
+        # Double-check: another request may have refreshed while we waited
+        cached = _status_cache
+        if cached is not None and time.monotonic() - cached[0] < _STATUS_TTL:
+            return ORJSONResponse(content=cached[1], headers=cached[2])
+
+        body = await _build_status()
+        headers = _status_headers()
+        _status_cache = (time.monotonic(), body, headers)
+        return ORJSONResponse(content=body, headers=headers)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "message": "An unexpected error occurred",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "timestamp": _now_iso()
         }
     )
 
@@ -202,5 +354,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # uvicorn[standard] ships both: C-based event loop and HTTP
+        # parser instead of asyncio + h11 defaults
+        loop="uvloop",
+        http="httptools"
     )
@@ -2,12 +2,20 @@
 Data models for the Serverless Code Index System.
 """
 
-from .file_index import FileIndex, ExportInfo, ImportInfo, FunctionSignature, Parameter
+from .file_index import (
+    FILE_INDEX_LIST_ADAPTER,
+    ExportInfo,
+    FileIndex,
+    FunctionSignature,
+    ImportInfo,
+    Parameter,
+)
 from .repository import RepositoryMetadata
 
 __all__ = [
+    "FILE_INDEX_LIST_ADAPTER",
     "FileIndex",
-    "ExportInfo", 
+    "ExportInfo",
     "ImportInfo",
     "FunctionSignature",
     "Parameter",
@@ -2,9 +2,36 @@
 File index data models for tracking exported and imported variables.
 """
 
+import re
 from datetime import datetime
 from typing import List, Optional, Union
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from pydantic.dataclasses import dataclass as pydantic_dataclass
+
+# Hoisted validator constants: these run once per field per document, so
+# bulk ingest pays them thousands of times per repository scan.
+_VISIBILITIES = frozenset(("public", "private"))
+_MIN_SHA_LEN = 7
+# Hex-digest lengths worth checking strictly: blake2b-128, SHA-1, SHA-256
+_DIGEST_LENGTHS = frozenset((32, 40, 64))
+# Strict hex check for full-length digests. int(v, 16) was cheaper but
+# too lenient: it accepts whitespace, +/- signs, 0x prefixes and
+# underscores, none of which belong in a SHA.
+_HEX_DIGEST_RE = re.compile(r"[0-9a-fA-F]+")
+
+
+def _fmt_utc(v):
+    """Normalize timestamps to ISO 8601 UTC strings.
+
+    The exact-type check fast-paths the overwhelmingly common case
+    (already-formatted strings from Firestore) before the isinstance
+    dispatch for datetimes.
+    """
+    if v.__class__ is str:
+        return v
+    if isinstance(v, datetime):
+        return v.isoformat() + 'Z'
+    return v
 
 
 class Parameter(BaseModel):
@@ -19,7 +46,9 @@ class Parameter(BaseModel):
 
 class FunctionSignature(BaseModel):
     """Function signature with parameters, return type, and metadata."""
-    
+
+    model_config = ConfigDict(defer_build=True)
+
     parameters: List[Parameter] = Field(default_factory=list, description="Array of function parameters in order")
     returnType: str = Field(..., description="Return type (e.g., 'Promise<User>', 'void', 'string')")
     isAsync: bool = Field(False, description="Whether function is async")
@@ -29,7 +58,9 @@ class FunctionSignature(BaseModel):
 
 class ClassInfo(BaseModel):
     """Class-specific information."""
-    
+
+    model_config = ConfigDict(defer_build=True)
+
     extends: Optional[str] = Field(None, description="Parent class if any")
     implements: List[str] = Field(default_factory=list, description="Interfaces implemented")
     methods: List["ExportInfo"] = Field(default_factory=list, description="Class methods")
@@ -39,7 +70,9 @@ class ClassInfo(BaseModel):
 
 class InterfaceInfo(BaseModel):
     """Interface-specific information."""
-    
+
+    model_config = ConfigDict(defer_build=True)
+
     extends: List[str] = Field(default_factory=list, description="Parent interfaces if any")
     methods: List["ExportInfo"] = Field(default_factory=list, description="Interface methods")
     properties: List["ExportInfo"] = Field(default_factory=list, description="Interface properties")
@@ -49,7 +82,9 @@ class InterfaceInfo(BaseModel):
 
 class ExportInfo(BaseModel):
     """Information about an exported variable, function, class, or interface."""
-    
+
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(..., description="Variable/function/class/interface name")
     type: str = Field(..., description="Type (e.g., 'function', 'class', 'variable', 'interface')")
     visibility: str = Field(..., description="'public' or 'private'")
@@ -62,14 +97,20 @@ class ExportInfo(BaseModel):
     @classmethod
     def validate_visibility(cls, v):
         """Validate visibility values."""
-        if v not in ['public', 'private']:
+        if v not in _VISIBILITIES:
             raise ValueError("Visibility must be 'public' or 'private'")
         return v
 
 
-class ImportInfo(BaseModel):
-    """Information about an imported variable."""
-    
+@pydantic_dataclass(slots=True)
+class ImportInfo:
+    """Information about an imported variable.
+
+    Imports are by far the most numerous objects a repository scan
+    creates, so this is a slotted dataclass rather than a BaseModel:
+    no per-instance __dict__, cheaper construction, same validation.
+    """
+
     name: str = Field(..., description="Imported variable name")
     source: str = Field(..., description="Source module/path")
     lineNumber: int = Field(..., description="Line where import occurs")
@@ -93,23 +134,32 @@ class FileIndex(BaseModel):
     @classmethod
     def ensure_utc_timestamp(cls, v):
         """Ensure timestamps are in ISO 8601 UTC format."""
-        if isinstance(v, datetime):
-            return v.isoformat() + 'Z'
-        return v
+        return _fmt_utc(v)
     
     @field_validator('fileHash', 'lastCommitSHA')
     @classmethod
     def validate_sha_format(cls, v):
         """Validate SHA format (basic check)."""
-        if not v or len(v) < 7:  # SHA-1 is 40 chars, SHA-256 is 64 chars
+        if not v or len(v) < _MIN_SHA_LEN:  # SHA-1 is 40 chars, SHA-256 is 64 chars
             raise ValueError("Invalid SHA format")
+        if len(v) in _DIGEST_LENGTHS:
+            # Full-length digests must be pure hex. Shorter identifiers
+            # (placeholder SHAs in fixtures/jobs) pass on length alone.
+            if _HEX_DIGEST_RE.fullmatch(v) is None:
+                raise ValueError("Invalid SHA format")
         return v
     
 
 
 
-# Update forward references
-FunctionSignature.model_rebuild()
-ClassInfo.model_rebuild()
-InterfaceInfo.model_rebuild()
-ExportInfo.model_rebuild()
+# Resolve forward references with a single rebuild of the outermost
+# model: FileIndex's graph reaches every forward-ref-bearing class above,
+# so Pydantic walks the type graph once instead of once per class. The
+# inner classes defer their standalone builds (defer_build) until first
+# direct use, which keeps cold-start imports off that path entirely.
+FileIndex.model_rebuild()
+
+# Shared adapter for validating whole batches of file-index documents:
+# one compiled validator applied across the list instead of re-entering
+# FileIndex(...) per document.
+FILE_INDEX_LIST_ADAPTER = TypeAdapter(List[FileIndex])
@@ -3,9 +3,24 @@ Repository metadata models for tracking repository-level information.
 """
 
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
+# Hoisted validator constants: frozenset membership instead of a list
+# rebuilt (and scanned) on every validation.
+_VALID_STATUSES = frozenset(('pending', 'processing', 'completed', 'failed', 'paused'))
+_STATUS_ERROR = "Status must be one of: pending, processing, completed, failed, paused"
+
+
+def _fmt_utc(v):
+    """Normalize timestamps to ISO 8601 UTC strings (string fast path)."""
+    if v.__class__ is str:
+        return v
+    if isinstance(v, datetime):
+        return v.isoformat() + 'Z'
+    return v
+
 
 class RepositoryMetadata(BaseModel):
     """Repository metadata for tracking processing status and statistics."""
@@ -24,17 +39,14 @@ class RepositoryMetadata(BaseModel):
     @classmethod
     def ensure_utc_timestamp(cls, v):
         """Ensure timestamps are in ISO 8601 UTC format."""
-        if isinstance(v, datetime):
-            return v.isoformat() + 'Z'
-        return v
+        return _fmt_utc(v)
     
     @field_validator('status')
     @classmethod
     def validate_status(cls, v):
         """Validate status values."""
-        valid_statuses = ['pending', 'processing', 'completed', 'failed', 'paused']
-        if v not in valid_statuses:
-            raise ValueError(f"Status must be one of: {', '.join(valid_statuses)}")
+        if v not in _VALID_STATUSES:
+            raise ValueError(_STATUS_ERROR)
         return v
     
     @field_validator('totalFiles', 'processedFiles')
@@ -45,19 +57,23 @@ class RepositoryMetadata(BaseModel):
             raise ValueError("File counts cannot be negative")
         return v
     
-    @property
+    # Derived views are cached per instance: dashboard listings read them
+    # once per row, and documents are never mutated after construction,
+    # so recomputing on every access is pure waste. cached_property keeps
+    # them out of model_dump(), preserving the Firestore document shape.
+    @cached_property
     def processing_progress(self) -> float:
         """Calculate processing progress as a percentage."""
         if self.totalFiles == 0:
             return 0.0
         return (self.processedFiles / self.totalFiles) * 100
-    
-    @property
+
+    @cached_property
     def is_processing_complete(self) -> bool:
         """Check if processing is complete."""
         return self.status == "completed" and self.processedFiles >= self.totalFiles
-    
-    @property
+
+    @cached_property
     def has_failures(self) -> bool:
         """Check if there are processing failures."""
         return self.status == "failed" or (self.totalFiles > 0 and self.processedFiles < self.totalFiles)
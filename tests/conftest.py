@@ -0,0 +1,132 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.core.config import get_settings
+
+FIRESTORE_EMULATOR_PORT = 8080
+FIRESTORE_EMULATOR_PROJECT = "test-project"
+
+
+@pytest.fixture
+def clear_settings_cache():
+    """Invalidate the cached Settings around tests that patch the environment.
+
+    get_settings() is lru_cached so the process parses configuration only
+    once; tests that mutate environment variables must drop the cached
+    instance on both sides or stale values leak between tests.
+    """
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def code_parser():
+    """One CodeParser for the whole session.
+
+    Construction builds every language parser (tree-sitter setup), so
+    per-test instantiation repeats that cost; this rides the process-wide
+    shared instance. Imported lazily to keep collection cheap.
+    """
+    from src.core.parser import get_code_parser
+
+    return get_code_parser()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def api_client():
+    """Shared keep-alive HTTP client for tests hitting the local API.
+
+    One pooled client per session reuses sockets across requests instead
+    of paying a TCP handshake per test. (HTTP/2 is pointless against the
+    local cleartext uvicorn, so the client stays on HTTP/1.1 keep-alive.)
+    """
+    async with httpx.AsyncClient(
+        base_url="http://localhost:8000",
+        timeout=300.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def firestore_emulator():
+    """Start one Firestore emulator for the whole test session.
+
+    Starting the emulator per test paid a multi-second startup plus a
+    blind 5s sleep every time; session scope amortizes the startup once,
+    and polling the TCP port replaces the sleep with an actual readiness
+    probe.
+    """
+    if shutil.which("gcloud") is None:
+        pytest.skip("gcloud CLI not available for the Firestore emulator")
+
+    # Explicit MonkeyPatch because the built-in fixture is function
+    # scoped; undo() in teardown restores the environment so later tests
+    # cannot be silently redirected to a dead emulator and stall in
+    # connection retries
+    mp = pytest.MonkeyPatch()
+    mp.setenv("FIRESTORE_EMULATOR_HOST", f"localhost:{FIRESTORE_EMULATOR_PORT}")
+    mp.setenv("GCP_PROJECT_ID", FIRESTORE_EMULATOR_PROJECT)
+    get_settings.cache_clear()
+
+    # start_new_session puts gcloud and the JVM it spawns in their own
+    # process group, so teardown can kill the whole tree; terminating
+    # only the wrapper leaves an orphaned JVM holding the port
+    proc = subprocess.Popen(
+        [
+            "gcloud", "emulators", "firestore", "start",
+            "--project", FIRESTORE_EMULATOR_PROJECT,
+            "--host-port", f"localhost:{FIRESTORE_EMULATOR_PORT}",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(
+                ("localhost", FIRESTORE_EMULATOR_PORT), timeout=0.1
+            ).close()
+            break
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                _terminate_group(proc)
+                pytest.fail("Firestore emulator failed to start within 30s")
+            time.sleep(0.01)
+
+    yield proc
+
+    _terminate_group(proc)
+    mp.undo()
+    get_settings.cache_clear()
+
+
+def _terminate_group(proc: subprocess.Popen) -> None:
+    """Terminate a process and everything in its process group."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,3 @@
+"""
+Lightweight in-memory fakes for external services used in tests.
+"""
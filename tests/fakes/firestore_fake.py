@@ -0,0 +1,169 @@
+"""
+In-memory Firestore double for unit tests.
+
+A dict-backed stand-in for google.cloud.firestore.Client: cheaper than
+building Mock chains per test, and reads return exactly what was
+written, so assertions can check stored documents instead of call
+counts.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeDocumentSnapshot:
+    """Snapshot of a document at read time."""
+
+    def __init__(
+        self,
+        doc_id: str,
+        data: Optional[Dict[str, Any]],
+        reference: Optional["FakeDocumentRef"] = None,
+    ):
+        self.id = doc_id
+        self._data = data
+        self.reference = reference
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    """Document reference recording writes against its collection."""
+
+    def __init__(self, collection: "FakeCollection", doc_id: str):
+        self._collection = collection
+        self.id = doc_id
+        self.writes: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+
+    @property
+    def path(self) -> str:
+        return "/".join(self._collection._path) + "/" + self.id
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        if merge and self.id in self._collection._docs:
+            self._collection._docs[self.id].update(data)
+        else:
+            self._collection._docs[self.id] = dict(data)
+        self.writes.append(("set", dict(data)))
+
+    def get(self) -> FakeDocumentSnapshot:
+        return FakeDocumentSnapshot(self.id, self._collection._docs.get(self.id))
+
+    def update(self, data: Dict[str, Any]) -> None:
+        if self.id not in self._collection._docs:
+            raise KeyError(f"Document {self.id} does not exist")
+        self._collection._docs[self.id].update(data)
+        self.writes.append(("update", dict(data)))
+
+    def delete(self) -> None:
+        self._collection._docs.pop(self.id, None)
+        self.writes.append(("delete", None))
+
+
+class FakeCollection:
+    """Collection holding documents in a plain dict."""
+
+    def __init__(self, path: str):
+        self._path = tuple(path.split("/"))
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._refs: Dict[str, FakeDocumentRef] = {}
+        self._auto_id = 0
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentRef:
+        if doc_id is None:
+            self._auto_id += 1
+            doc_id = f"auto-id-{self._auto_id}"
+        if doc_id not in self._refs:
+            self._refs[doc_id] = FakeDocumentRef(self, doc_id)
+        return self._refs[doc_id]
+
+    def stream(self):
+        for doc_id, data in list(self._docs.items()):
+            yield FakeDocumentSnapshot(doc_id, data)
+
+    def where(self, filter=None) -> "FakeQuery":
+        return FakeQuery(self, filter)
+
+
+class FakeQuery:
+    """Equality-filtered view over a collection (FieldFilter semantics)."""
+
+    def __init__(self, collection: FakeCollection, field_filter):
+        self._collection = collection
+        self._filter = field_filter
+
+    def stream(self):
+        for doc_id, data in list(self._collection._docs.items()):
+            if self._filter is None or (
+                self._filter.op_string == "=="
+                and data.get(self._filter.field_path) == self._filter.value
+            ):
+                yield FakeDocumentSnapshot(doc_id, data)
+
+
+class FakeWriteBatch:
+    """Batch that queues writes and applies them on commit."""
+
+    def __init__(self):
+        self._ops: List[Tuple[str, FakeDocumentRef, Optional[Dict[str, Any]]]] = []
+
+    def set(self, doc_ref: FakeDocumentRef, data: Dict[str, Any]) -> None:
+        self._ops.append(("set", doc_ref, data))
+
+    def delete(self, doc_ref: FakeDocumentRef) -> None:
+        self._ops.append(("delete", doc_ref, None))
+
+    def commit(self) -> None:
+        for op, doc_ref, data in self._ops:
+            if op == "set":
+                doc_ref.set(data)
+            else:
+                doc_ref.delete()
+        self._ops.clear()
+
+
+class FakeBulkWriter:
+    """BulkWriter that queues writes and applies them on flush."""
+
+    def __init__(self):
+        self._ops: List[Tuple[FakeDocumentRef, Dict[str, Any]]] = []
+
+    def set(self, doc_ref: FakeDocumentRef, data: Dict[str, Any]) -> None:
+        self._ops.append((doc_ref, data))
+
+    def flush(self) -> None:
+        for doc_ref, data in self._ops:
+            doc_ref.set(data)
+        self._ops.clear()
+
+
+class FakeFirestoreClient:
+    """Dict-backed double for google.cloud.firestore.Client."""
+
+    def __init__(self):
+        self._collections: Dict[str, FakeCollection] = {}
+
+    def collection(self, path: str) -> FakeCollection:
+        if path not in self._collections:
+            self._collections[path] = FakeCollection(path)
+        return self._collections[path]
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch()
+
+    def bulk_writer(self) -> FakeBulkWriter:
+        return FakeBulkWriter()
+
+    def get_all(self, refs: List[FakeDocumentRef]):
+        for ref in refs:
+            yield FakeDocumentSnapshot(
+                ref.id, ref._collection._docs.get(ref.id), reference=ref
+            )
+
+    def clear(self) -> None:
+        """Drop all stored documents (for reuse across tests)."""
+        self._collections.clear()
@@ -0,0 +1,72 @@
+"""
+Benchmark for the parse + index + store pipeline.
+
+Tracks the cost of `parse_file + FileIndex construction + batched write`
+across changes so regressions (per-file round trips, blocking sleeps in
+the loop) fail visibly instead of silently slowing the suite. Run via
+`pytest --benchmark-only tests/test_benchmark_real_repository.py`; the
+module skips itself when pytest-benchmark is not installed.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.models.file_index import FileIndex
+from tests.fakes.firestore_fake import FakeFirestoreClient
+from tests.test_real_repository import (
+    FIXED_TS,
+    _LANG_BY_SUFFIX,
+    _get_mock_file_content,
+)
+
+pytestmark = pytest.mark.slow
+
+_MOCK_FILES = [
+    "src/index.ts",
+    "src/array.ts",
+    "src/types.ts",
+    "test/array.test.ts",
+    "package.json",
+    "tsconfig.json",
+    "eslint.config.ts",
+]
+
+
+def test_bench_process_files(benchmark, code_parser):
+    """Benchmark the full mock-repository processing pipeline."""
+    from src.core.database import FirestoreDatabase
+
+    async def _process_all() -> int:
+        db = FirestoreDatabase(client=FakeFirestoreClient())
+
+        async def _process_one(file_path: str) -> FileIndex:
+            parse_result = await code_parser.parse_file(
+                file_path, _get_mock_file_content(file_path)
+            )
+            return FileIndex.model_construct(
+                repoId="ts-array-bench",
+                filePath=file_path,
+                fileHash="mock_hash_" + file_path,
+                lastCommitSHA="mock_commit_sha",
+                lastCommitTimestamp=FIXED_TS,
+                exports=parse_result.exports,
+                imports=parse_result.imports,
+                updatedAt=FIXED_TS,
+                language=_LANG_BY_SUFFIX.get(
+                    os.path.splitext(file_path)[1], "text"
+                ),
+                parseErrors=parse_result.parse_errors,
+            )
+
+        file_indexes = list(
+            await asyncio.gather(*[_process_one(f) for f in _MOCK_FILES])
+        )
+        assert await db.batch_write_file_indexes(file_indexes)
+        return len(file_indexes)
+
+    processed = benchmark(lambda: asyncio.run(_process_all()))
+    assert processed == len(_MOCK_FILES)
@@ -4,6 +4,7 @@ Tests for GCP integration components.
 
 import pytest
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 from datetime import datetime
 
@@ -12,6 +13,21 @@ from src.core.database import FirestoreDatabase
 from src.core.cloud_run_jobs import CloudRunJobsService
 from src.models.repository import RepositoryMetadata
 from src.models.file_index import FileIndex
+from tests.fakes.firestore_fake import FakeFirestoreClient
+
+
+# Shared timestamp literal for model construction in these tests
+FIXED_TS = "2025-01-26T00:00:00Z"
+
+
+@pytest.fixture(scope="module")
+def fake_firestore():
+    """One in-memory Firestore double shared across this module's tests.
+
+    Cheaper than rebuilding Mock chains per test, and reads return what
+    was written so assertions can inspect stored documents directly.
+    """
+    return FakeFirestoreClient()
 
 
 class TestConfiguration:
@@ -36,27 +52,25 @@ class TestFirestoreDatabase:
     """Test Firestore database operations."""
     
     @pytest.fixture
-    def mock_firestore_client(self):
-        """Mock Firestore client."""
-        with patch('src.core.database.firestore.Client') as mock_client:
-            mock_client.return_value = Mock()
-            yield mock_client
-    
-    @pytest.fixture
-    def database(self, mock_firestore_client):
-        """Create database instance with mocked client."""
-        with patch('src.core.config.get_settings') as mock_settings:
-            mock_settings.return_value = Mock(
+    def database(self, fake_firestore):
+        """Create database instance backed by the in-memory fake.
+
+        Settings are passed in directly rather than patched in, so no
+        unittest.mock machinery runs per test.
+        """
+        return FirestoreDatabase(
+            settings=Settings(
                 gcp_project_id="test-project",
-                firestore_collection_prefix="test_code_index"
-            )
-            return FirestoreDatabase()
-    
+                firestore_collection_prefix="test_code_index",
+            ),
+            client=fake_firestore,
+        )
+
     def test_database_initialization(self, database):
         """Test database initialization."""
         assert database.client is not None
         assert database.settings is not None
-    
+
     @pytest.mark.asyncio
     async def test_create_repository(self, database):
         """Test repository creation."""
@@ -65,72 +79,70 @@ class TestFirestoreDatabase:
             name="Test Repository",
             url="https://github.com/test/repo",
             lastProcessedCommit="",
-            lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
+            lastProcessedCommitTimestamp=FIXED_TS,
             totalFiles=0,
             processedFiles=0,
-            lastUpdated="2025-01-26T00:00:00Z",
+            lastUpdated=FIXED_TS,
             status="pending"
         )
-        
-        # Mock the document reference
-        mock_doc_ref = Mock()
-        database._get_document_ref = Mock(return_value=mock_doc_ref)
-        
+
         result = await database.create_repository(repo_data)
         assert result is True
-        mock_doc_ref.set.assert_called_once()
-    
+
+        # The fake records writes and stores the document verbatim
+        doc_ref = database._get_document_ref("repositories", "test-repo")
+        assert len(doc_ref.writes) == 1
+        assert doc_ref.get().to_dict()["repoId"] == "test-repo"
+
     @pytest.mark.asyncio
     async def test_get_repository(self, database):
         """Test repository retrieval."""
-        # Mock document snapshot
-        mock_doc_snapshot = Mock()
-        mock_doc_snapshot.exists = True
-        mock_doc_snapshot.to_dict.return_value = {
-            "repoId": "test-repo",
+        # Seed the fake with a stored document
+        database._get_document_ref("repositories", "test-repo-get").set({
+            "repoId": "test-repo-get",
             "name": "Test Repository",
             "url": "https://github.com/test/repo",
             "lastProcessedCommit": "",
-            "lastProcessedCommitTimestamp": "2025-01-26T00:00:00Z",
+            "lastProcessedCommitTimestamp": FIXED_TS,
             "totalFiles": 0,
             "processedFiles": 0,
-            "lastUpdated": "2025-01-26T00:00:00Z",
+            "lastUpdated": FIXED_TS,
             "status": "pending"
-        }
-        
-        mock_doc_ref = Mock()
-        mock_doc_ref.get.return_value = mock_doc_snapshot
-        database._get_document_ref = Mock(return_value=mock_doc_ref)
-        
-        result = await database.get_repository("test-repo")
+        })
+
+        result = await database.get_repository("test-repo-get")
         assert result is not None
-        assert result.repoId == "test-repo"
+        assert result.repoId == "test-repo-get"
         assert result.name == "Test Repository"
 
 
 class TestCloudRunJobsService:
     """Test Cloud Run Jobs service."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_jobs_client(self):
-        """Mock Cloud Run Jobs client."""
+        """Mock Cloud Run Jobs client (patched once for the module).
+
+        The patch stays valid for every test here; jobs_service remains
+        function-scoped so per-test side_effect tweaks don't leak.
+        """
         with patch('src.core.cloud_run_jobs.run_v2.JobsClient') as mock_client:
             mock_client.return_value = Mock()
             yield mock_client
     
     @pytest.fixture
     def jobs_service(self, mock_jobs_client):
-        """Create jobs service instance with mocked client."""
-        with patch('src.core.config.get_settings') as mock_settings:
-            mock_settings.return_value = Mock(
+        """Create jobs service instance with mocked client and injected settings."""
+        return CloudRunJobsService(
+            settings=Settings(
                 gcp_project_id="test-project",
                 cloud_run_jobs_location="europe-west4",
                 cloud_run_jobs_timeout=3600,
                 cloud_run_jobs_cpu=2,
                 cloud_run_jobs_memory="4Gi",
-                gcp_region="europe-west4"
+                gcp_region="europe-west4",
             )
-            return CloudRunJobsService()
+        )
     
     def test_jobs_service_initialization(self, jobs_service):
         """Test jobs service initialization."""
@@ -172,35 +184,36 @@ class TestCloudRunJobsService:
         mock_job_path = "projects/test-project/locations/europe-west4/jobs/code-index-test-repo"
         jobs_service._get_job_name = Mock(return_value=mock_job_path)
         
-        mock_job = Mock()
-        mock_job.name = "test-job"
-        mock_job.uid = "test-uid"
-        mock_job.generation = 1
-        mock_job.create_time = None
-        mock_job.update_time = None
-        mock_job.labels = {}
-        mock_job.annotations = {}
-        mock_job.delete_time = None
-        mock_job.expire_time = None
-        mock_job.creator = None
-        mock_job.last_modifier = None
-        mock_job.client = None
-        mock_job.client_version = None
-        mock_job.launch_stage = None
-        mock_job.binary_authorization = None
-        
-        # Mock template structure
-        mock_template = Mock()
-        mock_template.parallelism = 1
-        mock_template.task_count = 1
-        mock_template.timeout = "3600s"
-        mock_template.template = Mock()
-        mock_template.template.resources = Mock()
-        mock_template.template.resources.cpu = "2"
-        mock_template.template.resources.memory = "4Gi"
-        mock_template.template.image = "test-image"
-        mock_job.template = mock_template
-        
+        # A SimpleNamespace literal builds the whole job stub in one
+        # shot; assigning each field on a Mock allocates a child mock
+        # per attribute for no extra fidelity
+        mock_job = SimpleNamespace(
+            name="test-job",
+            uid="test-uid",
+            generation=1,
+            create_time=None,
+            update_time=None,
+            labels={},
+            annotations={},
+            delete_time=None,
+            expire_time=None,
+            creator=None,
+            last_modifier=None,
+            client=None,
+            client_version=None,
+            launch_stage=None,
+            binary_authorization=None,
+            template=SimpleNamespace(
+                parallelism=1,
+                task_count=1,
+                timeout="3600s",
+                template=SimpleNamespace(
+                    resources=SimpleNamespace(cpu="2", memory="4Gi"),
+                    image="test-image",
+                ),
+            ),
+        )
+
         jobs_service.client.get_job.return_value = mock_job
         
         result = await jobs_service.get_job_info("test-repo")
@@ -210,9 +223,10 @@ class TestCloudRunJobsService:
         assert result["generation"] == 1
 
 
+@pytest.mark.integration
 class TestIntegration:
-    """Integration tests for GCP components."""
-    
+    """Integration tests for GCP components (need real GCP credentials)."""
+
     @pytest.mark.asyncio
     async def test_end_to_end_workflow(self):
         """Test end-to-end workflow with mocked GCP services."""
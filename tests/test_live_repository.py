@@ -2,26 +2,27 @@
 Live integration test that clones and indexes the actual ts-array repository.
 """
 
-import asyncio
 import os
+import re
+import shutil
 import subprocess
 import tempfile
-import time
+import threading
+from collections import Counter
 from pathlib import Path
-from typing import Optional, List
+from typing import List
 
+import orjson
 import pytest
-import git
-import httpx
 from dotenv import load_dotenv
 
-from src.core.config import get_settings
 from src.core.database import FirestoreDatabase
-from src.core.indexer import FileIndexer
-from src.core.parser import CodeParser
-from src.models.repository import RepositoryMetadata
 from src.models.file_index import FileIndex
 
+# Needs network access, a running local API server and the Firestore
+# emulator; run via `pytest -m integration`
+pytestmark = pytest.mark.integration
+
 
 @pytest.fixture
 def emulator_port():
@@ -40,11 +41,18 @@ def temp_dir():
     """Temporary directory for cloning repository."""
     temp_dir = Path(tempfile.mkdtemp())
     yield temp_dir
-    # Cleanup
+    # Cleanup in the background: rmtree on a cloned .git tree unlinks
+    # thousands of small objects and would block teardown for seconds.
+    # The tempdir is exclusive to this test, so a daemon thread can
+    # delete it concurrently with the rest of the session.
     if temp_dir.exists():
-        import shutil
-        shutil.rmtree(temp_dir)
-        print("Repository cleanup completed")
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(str(temp_dir),),
+            kwargs={"ignore_errors": True},
+            daemon=True,
+        ).start()
+        print("Repository cleanup started in background")
 
 @pytest.fixture
 def repo_path(temp_dir):
@@ -75,76 +83,93 @@ def cloned_repo(repo_path):
     """Clone the ts-array repository."""
     try:
         print(f"Cloning repository to: {repo_path}")
-        
-        # Clone the repository
-        repo = git.Repo.clone_from(
-            "https://github.com/Jassu225/ts-array.git",
-            repo_path,
-            depth=1  # Shallow clone for speed
+
+        # Shallow, blobless, single-branch clone straight through git:
+        # blobs come down on demand so setup transfers far fewer bytes,
+        # and skipping GitPython avoids building Repo objects we never use
+        subprocess.run(
+            [
+                "git", "clone",
+                "--depth=1",
+                "--filter=blob:none",
+                "--single-branch",
+                "https://github.com/Jassu225/ts-array.git",
+                str(repo_path),
+            ],
+            check=True,
+            capture_output=True,
         )
-        
-        print(f"Repository cloned successfully. Latest commit: {repo.head.commit.hexsha[:8]}")
-        return repo
-        
+        head_sha = subprocess.check_output(
+            ["git", "-C", str(repo_path), "rev-parse", "HEAD"]
+        ).decode().strip()
+
+        print(f"Repository cloned successfully. Latest commit: {head_sha[:8]}")
+        return repo_path
+
     except Exception as e:
         print(f"Failed to clone repository: {e}")
         raise
 
+# Anchored alternation compiled once: the C regex engine fuses the
+# suffix split and compare that suffix-set membership would do in two
+# steps per entry. Binding .search skips the method lookup per call.
+_EXT_RE = re.compile(r'\.(?:ts|tsx|js|jsx|json|md)$').search
+
+
 def get_repository_files(repo_path: Path) -> List[Path]:
     """Get all relevant files from the cloned repository."""
     if not repo_path:
         return []
-    
-    # File extensions to process
-    extensions = {'.ts', '.js', '.tsx', '.jsx', '.json', '.md'}
-    
+
+    # Iterative os.scandir walk: DirEntry caches the type bits from the
+    # directory read, so this avoids rglob's per-entry Path allocation
+    # and extra stat calls, and prunes .git without descending into it
     files = []
-    for file_path in repo_path.rglob('*'):
-        if file_path.is_file() and file_path.suffix in extensions:
-            # Get relative path from repository root
-            relative_path = file_path.relative_to(repo_path)
-            files.append(relative_path)
-    
+    stack = [os.scandir(repo_path)]
+    while stack:
+        scandir_it = stack.pop()
+        with scandir_it:
+            for entry in scandir_it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != '.git':
+                        stack.append(os.scandir(entry.path))
+                elif entry.is_file(follow_symlinks=False) and _EXT_RE(entry.name):
+                    # Get relative path from repository root
+                    files.append(Path(entry.path).relative_to(repo_path))
+
     # Sort files for consistent processing order
     files.sort()
     return files
 
+# Suffix-to-language map: one dict lookup instead of a chain of
+# endswith compares per file
+_LANG_BY_SUFFIX = {
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".json": "json",
+    ".md": "markdown",
+}
+
+
 def get_language_from_path(file_path: str) -> str:
     """Determine language from file path."""
-    if file_path.endswith(".ts"):
-        return "typescript"
-    elif file_path.endswith(".js"):
-        return "javascript"
-    elif file_path.endswith(".tsx"):
-        return "typescript"
-    elif file_path.endswith(".jsx"):
-        return "javascript"
-    elif file_path.endswith(".json"):
-        return "json"
-    elif file_path.endswith(".md"):
-        return "markdown"
-    else:
-        return "text"
+    return _LANG_BY_SUFFIX.get(os.path.splitext(file_path)[1], "text")
 
 def print_indexing_statistics(file_indices: List[FileIndex]):
     """Print statistics about the indexed files."""
     print("\n📊 Indexing Statistics:")
     print("=" * 50)
-    
-    # Language distribution
-    languages = {}
-    total_exports = 0
-    total_imports = 0
-    
-    for file_index in file_indices:
-        lang = file_index.language
-        languages[lang] = languages.get(lang, 0) + 1
-        
-        total_exports += len(file_index.exports)
-        total_imports += len(file_index.imports)
-    
+
+    # Language distribution via Counter's C fast path; export/import
+    # totals as generator sums instead of per-file rebinding
+    languages = Counter(file_index.language for file_index in file_indices)
+    total_exports = sum(len(file_index.exports) for file_index in file_indices)
+    total_imports = sum(len(file_index.imports) for file_index in file_indices)
+
     print(f"Languages found:")
-    for lang, count in sorted(languages.items()):
+    for lang, count in languages.most_common():
         print(f"  {lang}: {count} files")
     
     print(f"\nTotal exports: {total_exports}")
@@ -161,7 +186,8 @@ def print_indexing_statistics(file_indices: List[FileIndex]):
             print("  No exports found")
 
 @pytest.mark.asyncio
-async def test_live_index_ts_array_repository(firestore_settings, cloned_repo, repo_path):
+@pytest.mark.xdist_group("local-services")
+async def test_live_index_ts_array_repository(firestore_settings, cloned_repo, repo_path, api_client):
     """Test indexing the actual cloned ts-array repository."""
     # Repository details
     repo_id = "ts-array-live"
@@ -172,10 +198,6 @@ async def test_live_index_ts_array_repository(firestore_settings, cloned_repo, r
     # Index repository using the API endpoint
     print(f"🔧 Indexing repository using API endpoint...")
     
-    # Import the API client
-    import httpx
-    import json
-    
     # Initialize database for verification with same settings as main app
     # Settings will come from .env.test file automatically
     db = FirestoreDatabase()
@@ -186,16 +208,19 @@ async def test_live_index_ts_array_repository(firestore_settings, cloned_repo, r
         "branch": "main"
     }
     
-    # Call the repository indexing endpoint
-    async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://localhost:8000/repositories/index",
-                json=index_request,
-                timeout=300.0  # 5 minutes timeout for indexing
-            )
-    
+    # Call the repository indexing endpoint through the session-scoped
+    # pooled client (no per-test TCP handshake); serialize the request
+    # body with orjson rather than httpx's stdlib json path
+    response = await api_client.post(
+        "/repositories/index",
+        content=orjson.dumps(index_request),
+        headers={"Content-Type": "application/json"},
+    )
+
     if response.status_code == 200:
-        results = response.json()
+        # orjson decodes large nested export/import payloads 2-3x faster
+        # than the stdlib parser behind response.json()
+        results = orjson.loads(response.content)
         print(f"✅ Repository indexing API call successful")
         
         # Extract results from API response
@@ -11,40 +11,37 @@ from src.models.file_index import (
 from src.models.repository import RepositoryMetadata
 
 
+# Shared timestamp literal: one constant instead of the same ISO
+# string repeated at every construction site
+FIXED_TS = "2025-01-26T00:00:00Z"
+
+
 class TestParameter:
     """Test Parameter model."""
-    
-    def test_parameter_creation(self):
+
+    @pytest.mark.parametrize(
+        "name,type_,required,default,description",
+        [
+            ("userData", "UserCreateInput", True, None, "User creation data"),
+            ("options", "CreateUserOptions", False, "{}", "Optional configuration"),
+        ],
+        ids=["required-no-default", "optional-with-default"],
+    )
+    def test_parameter_creation(self, name, type_, required, default, description):
         """Test creating a parameter with all fields."""
         param = Parameter(
-            name="userData",
-            type="UserCreateInput",
-            required=True,
-            defaultValue=None,
-            description="User creation data"
+            name=name,
+            type=type_,
+            required=required,
+            defaultValue=default,
+            description=description
         )
-        
-        assert param.name == "userData"
-        assert param.type == "UserCreateInput"
-        assert param.required is True
-        assert param.defaultValue is None
-        assert param.description == "User creation data"
-    
-    def test_parameter_with_default_value(self):
-        """Test creating a parameter with default value."""
-        param = Parameter(
-            name="options",
-            type="CreateUserOptions",
-            required=False,
-            defaultValue="{}",
-            description="Optional configuration"
-        )
-        
-        assert param.name == "options"
-        assert param.type == "CreateUserOptions"
-        assert param.required is False
-        assert param.defaultValue == "{}"
-        assert param.description == "Optional configuration"
+
+        assert param.name == name
+        assert param.type == type_
+        assert param.required is required
+        assert param.defaultValue == default
+        assert param.description == description
 
 
 class TestFunctionSignature:
@@ -144,10 +141,10 @@ class TestFileIndex:
             filePath="src/services/user.ts",
             fileHash="abc123def456",
             lastCommitSHA="commit123",
-            lastCommitTimestamp="2025-01-26T00:00:00Z",
+            lastCommitTimestamp=FIXED_TS,
             exports=exports,
             imports=imports,
-            updatedAt="2025-01-26T00:00:00Z",
+            updatedAt=FIXED_TS,
             language="typescript",
             parseErrors=[]
         )
@@ -156,30 +153,38 @@ class TestFileIndex:
         assert file_index.filePath == "src/services/user.ts"
         assert file_index.fileHash == "abc123def456"
         assert file_index.lastCommitSHA == "commit123"
-        assert file_index.lastCommitTimestamp == "2025-01-26T00:00:00Z"
+        assert file_index.lastCommitTimestamp == FIXED_TS
         assert len(file_index.exports) == 1
         assert len(file_index.imports) == 1
         assert file_index.language == "typescript"
         assert len(file_index.parseErrors) == 0
     
-    def test_file_index_validation(self):
-        """Test file index validation."""
-        # Test invalid SHA format
-        with pytest.raises(ValueError, match="Invalid SHA format"):
+    @pytest.mark.parametrize(
+        "file_hash,exc_match",
+        [
+            ("abc", "Invalid SHA format"),  # Too short (less than 7 characters)
+            ("z" * 40, "Invalid SHA format"),  # Digest-length but not hex
+        ],
+        ids=["too-short", "non-hex-digest"],
+    )
+    def test_file_index_invalid_hash(self, file_hash, exc_match):
+        """Test file index SHA validation failures."""
+        with pytest.raises(ValueError, match=exc_match):
             FileIndex(
                 repoId="example-repo",
                 filePath="src/test.ts",
-                fileHash="abc",  # Too short (less than 7 characters)
+                fileHash=file_hash,
                 lastCommitSHA="commit123",
-                lastCommitTimestamp="2025-01-26T00:00:00Z",
+                lastCommitTimestamp=FIXED_TS,
                 exports=[],
                 imports=[],
-                updatedAt="2025-01-26T00:00:00Z",
+                updatedAt=FIXED_TS,
                 language="typescript",
                 parseErrors=[]
             )
-        
-        # Test invalid visibility
+
+    def test_export_info_invalid_visibility(self):
+        """Test export visibility validation failure."""
         with pytest.raises(ValueError, match="Visibility must be 'public' or 'private'"):
             ExportInfo(
                 name="test",
@@ -189,23 +194,34 @@ class TestFileIndex:
             )
 
 
+@pytest.fixture(scope="module")
+def sample_repo():
+    """One validated RepositoryMetadata shared by the read-only tests.
+
+    Module scope means the construction-time validators run once instead
+    of once per test; tests that exercise the validation error paths
+    still construct inline.
+    """
+    return RepositoryMetadata(
+        repoId="example-repo",
+        name="Example Repository",
+        url="https://github.com/example/repo",
+        lastProcessedCommit="commit123",
+        lastProcessedCommitTimestamp=FIXED_TS,
+        totalFiles=100,
+        processedFiles=85,
+        lastUpdated=FIXED_TS,
+        status="processing"
+    )
+
+
 class TestRepositoryMetadata:
     """Test RepositoryMetadata model."""
-    
-    def test_repository_metadata_creation(self):
+
+    def test_repository_metadata_creation(self, sample_repo):
         """Test creating repository metadata."""
-        repo = RepositoryMetadata(
-            repoId="example-repo",
-            name="Example Repository",
-            url="https://github.com/example/repo",
-            lastProcessedCommit="commit123",
-            lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
-            totalFiles=100,
-            processedFiles=85,
-            lastUpdated="2025-01-26T00:00:00Z",
-            status="processing"
-        )
-        
+        repo = sample_repo
+
         assert repo.repoId == "example-repo"
         assert repo.name == "Example Repository"
         assert repo.url == "https://github.com/example/repo"
@@ -214,20 +230,10 @@ class TestRepositoryMetadata:
         assert repo.processedFiles == 85
         assert repo.status == "processing"
     
-    def test_repository_metadata_properties(self):
+    def test_repository_metadata_properties(self, sample_repo):
         """Test repository metadata computed properties."""
-        repo = RepositoryMetadata(
-            repoId="example-repo",
-            name="Example Repository",
-            url="https://github.com/example/repo",
-            lastProcessedCommit="commit123",
-            lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
-            totalFiles=100,
-            processedFiles=85,
-            lastUpdated="2025-01-26T00:00:00Z",
-            status="processing"
-        )
-        
+        repo = sample_repo
+
         assert repo.processing_progress == 85.0
         assert repo.is_processing_complete is False
         assert repo.has_failures is True
@@ -241,10 +247,10 @@ class TestRepositoryMetadata:
                 name="Example Repository",
                 url="https://github.com/example/repo",
                 lastProcessedCommit="commit123",
-                lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
+                lastProcessedCommitTimestamp=FIXED_TS,
                 totalFiles=100,
                 processedFiles=85,
-                lastUpdated="2025-01-26T00:00:00Z",
+                lastUpdated=FIXED_TS,
                 status="invalid"  # Invalid status
             )
         
@@ -255,9 +261,9 @@ class TestRepositoryMetadata:
                 name="Example Repository",
                 url="https://github.com/example/repo",
                 lastProcessedCommit="commit123",
-                lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
+                lastProcessedCommitTimestamp=FIXED_TS,
                 totalFiles=-1,  # Invalid negative count
                 processedFiles=0,
-                lastUpdated="2025-01-26T00:00:00Z",
+                lastUpdated=FIXED_TS,
                 status="pending"
             )
@@ -1,263 +1,247 @@
 """
-Real integration test using Firestore emulator to index the ts-array repository.
+Indexes the mock ts-array repository through the real parse/store pipeline.
+
+Runs in the default pytest lane against the in-memory Firestore fake:
+`pytest tests/test_real_repository.py`.
 """
 
 import asyncio
+import logging
 import os
-import subprocess
-import time
-from pathlib import Path
 from typing import Optional
 
 import pytest
-from unittest.mock import Mock, patch
 
-from src.core.config import get_settings
-from src.core.database import FirestoreDatabase
-from src.core.indexer import FileIndexer
-from src.core.parser import CodeParser
 from src.models.repository import RepositoryMetadata
 from src.models.file_index import FileIndex
+from tests.fakes.firestore_fake import FakeFirestoreClient
+
+# Suffix-to-language map: one dict lookup instead of endswith compares
+_LANG_BY_SUFFIX = {
+    ".ts": "typescript",
+    ".js": "javascript",
+    ".json": "json",
+}
+
+# Mock sources built once at import; the per-call path is a dict lookup
+# instead of re-evaluating a branch chain of triple-quoted literals
+_TS_TEST_CONTENT = """
+import { describe, it, expect } from '@jest/globals';
+import { ArrayUtils } from '../src/array';
+
+describe('ArrayUtils', () => {
+    it('should create array with specified length', () => {
+        const result = ArrayUtils.create(5);
+        expect(result).toHaveLength(5);
+    });
+});
+"""
+
+_TS_CONTENT = """
+export class ArrayUtils {
+    static create<T>(length: number, defaultValue?: T): T[] {
+        return new Array(length).fill(defaultValue);
+    }
+
+    static isEmpty<T>(array: T[]): boolean {
+        return array.length === 0;
+    }
+
+    static isNotEmpty<T>(array: T[]): boolean {
+        return !this.isEmpty(array);
+    }
+}
+
+export interface ArrayOptions {
+    unique?: boolean;
+    sorted?: boolean;
+}
+"""
+
+_JSON_CONTENT = """
+{
+    "name": "ts-array",
+    "version": "1.0.0",
+    "description": "TypeScript array utilities",
+    "main": "dist/index.js",
+    "types": "dist/index.d.ts",
+    "scripts": {
+        "build": "tsc",
+        "test": "jest"
+    }
+}
+"""
+
+_JS_CONTENT = """
+module.exports = {
+    // JavaScript configuration
+};
+"""
+
+_DEFAULT_CONTENT = "# Configuration file"
+
+_CONTENT_BY_SUFFIX = {
+    ".ts": _TS_CONTENT,
+    ".json": _JSON_CONTENT,
+    ".js": _JS_CONTENT,
+}
+
+# Shared timestamp literal for model construction in this test
+FIXED_TS = "2025-01-26T00:00:00Z"
+
+logger = logging.getLogger(__name__)
 
 
-class TestRealRepositoryIndexing:
-    """Test indexing a real GitHub repository using Firestore emulator."""
+def _get_mock_file_content(file_path: str) -> str:
+    """Get mock file content based on the file path."""
+    if file_path.endswith(".ts") and "test" in file_path:
+        return _TS_TEST_CONTENT
+    return _CONTENT_BY_SUFFIX.get(os.path.splitext(file_path)[1], _DEFAULT_CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_index_ts_array_repository(code_parser):
+    """Test indexing a repository through the real parse/store pipeline.
+
+    The test exercises CRUD semantics end to end, so the database runs
+    against the in-memory Firestore fake: same FirestoreDatabase code
+    paths, no gcloud emulator JVM to boot. The session-scoped
+    firestore_emulator fixture in conftest.py remains available for
+    opt-in runs against the real emulator.
+    """
+    # Imported here so collection stays cheap: the database module
+    # drags in the Firestore gRPC stack, which `--collect-only` and
+    # deselected runs should not pay for
+    from src.core.config import get_settings
+    from src.core.database import FirestoreDatabase
+
+    # Repository details
+    repo_id = "ts-array"
+    repo_url = "https://github.com/Jassu225/ts-array"
+
+    logger.debug("Starting to index repository: %s", repo_id)
+
+    # Initialize services
+    db = FirestoreDatabase(client=FakeFirestoreClient())
+    parser = code_parser
     
-    def __init__(self):
-        self.emulator_process: Optional[subprocess.Popen] = None
-        self.emulator_port = 8080
-        self.project_id = "test-project"
-        
-    def setup_method(self):
-        """Set up Firestore emulator before each test."""
-        self.start_firestore_emulator()
-        
-    def teardown_method(self):
-        """Clean up Firestore emulator after each test."""
-        self.stop_firestore_emulator()
+    # Create repository metadata
+    repo_metadata = RepositoryMetadata(
+        repoId=repo_id,
+        name="ts-array",
+        url=repo_url,
+        lastProcessedCommit="",
+        lastProcessedCommitTimestamp=FIXED_TS,
+        totalFiles=0,
+        processedFiles=0,
+        lastUpdated=FIXED_TS,
+        status="pending"
+    )
     
-    def start_firestore_emulator(self):
-        """Start the Firestore emulator."""
-        try:
-            # Set environment variables for emulator
-            os.environ["FIRESTORE_EMULATOR_HOST"] = f"localhost:{self.emulator_port}"
-            os.environ["GCP_PROJECT_ID"] = self.project_id
-            
-            # Start emulator
-            cmd = [
-                "gcloud", "emulators", "firestore", "start",
-                "--project", self.project_id,
-                "--host-port", f"localhost:{self.emulator_port}"
-            ]
-            
-            self.emulator_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Wait for emulator to start
-            time.sleep(5)
-            print(f"Firestore emulator started on port {self.emulator_port}")
-            
-        except Exception as e:
-            print(f"Failed to start Firestore emulator: {e}")
-            raise
+    # Store repository in database
+    await db.create_repository(repo_metadata)
+    logger.debug("Repository %s created in database", repo_id)
     
-    def stop_firestore_emulator(self):
-        """Stop the Firestore emulator."""
-        if self.emulator_process:
-            try:
-                self.emulator_process.terminate()
-                self.emulator_process.wait(timeout=10)
-                print("Firestore emulator stopped")
-            except subprocess.TimeoutExpired:
-                self.emulator_process.kill()
-                print("Firestore emulator forcefully stopped")
+    # Mock file list for ts-array repository
+    # Based on the repository structure we can see
+    mock_files = [
+        "src/index.ts",
+        "src/array.ts", 
+        "src/types.ts",
+        "test/array.test.ts",
+        "package.json",
+        "tsconfig.json",
+        "eslint.config.ts"
+    ]
     
-    @pytest.mark.asyncio
-    async def test_index_ts_array_repository(self):
-        """Test indexing the actual ts-array repository."""
-        # Repository details
-        repo_id = "ts-array"
-        repo_url = "https://github.com/Jassu225/ts-array"
-        
-        print(f"Starting to index repository: {repo_id}")
-        
-        # Initialize services
-        db = FirestoreDatabase()
-        indexer = FileIndexer()
-        parser = CodeParser()
-        
-        # Create repository metadata
-        repo_metadata = RepositoryMetadata(
-            repoId=repo_id,
-            name="ts-array",
-            url=repo_url,
-            lastProcessedCommit="",
-            lastProcessedCommitTimestamp="2025-01-26T00:00:00Z",
-            totalFiles=0,
-            processedFiles=0,
-            lastUpdated="2025-01-26T00:00:00Z",
-            status="pending"
-        )
-        
-        # Store repository in database
-        await db.create_repository(repo_metadata)
-        print(f"Repository {repo_id} created in database")
-        
-        # Mock file list for ts-array repository
-        # Based on the repository structure we can see
-        mock_files = [
-            "src/index.ts",
-            "src/array.ts", 
-            "src/types.ts",
-            "test/array.test.ts",
-            "package.json",
-            "tsconfig.json",
-            "eslint.config.ts"
-        ]
-        
-        print(f"Processing {len(mock_files)} files from {repo_id}")
-        
-        # Process each file
-        processed_files = 0
-        for file_path in mock_files:
+    logger.debug("Processing %d files from %s", len(mock_files), repo_id)
+    
+    # Process files concurrently: the work is I/O-bound (parse plus a
+    # Firestore round trip per file), so a bounded gather overlaps the
+    # round trips instead of paying them one at a time
+    sem = asyncio.Semaphore(get_settings().max_concurrent_files)
+
+    # Constant per-run fields hoisted out of the per-file closure
+    now_iso = FIXED_TS
+    commit_sha = "mock_commit_sha"
+
+    async def _process_one(file_path: str) -> Optional[FileIndex]:
+        async with sem:
             try:
                 # Create mock file content based on file type
-                file_content = self._get_mock_file_content(file_path)
-                
+                file_content = _get_mock_file_content(file_path)
+
                 # Parse the file
                 parse_result = await parser.parse_file(file_path, file_content)
-                
-                if parse_result:
-                    # Create file index
-                    file_index = FileIndex(
-                        repoId=repo_id,
-                        filePath=file_path,
-                        fileHash=f"mock_hash_{file_path}",
-                        lastCommitSHA="mock_commit_sha",
-                        lastCommitTimestamp="2025-01-26T00:00:00Z",
-                        exports=parse_result.get("exports", []),
-                        imports=parse_result.get("imports", []),
-                        updatedAt="2025-01-26T00:00:00Z",
-                        language=self._get_language_from_path(file_path),
-                        parseErrors=parse_result.get("errors", [])
-                    )
-                    
-                    # Store in database
-                    await db.create_or_update_file_index(repo_id, file_path, file_index)
-                    processed_files += 1
-                    print(f"✓ Processed: {file_path}")
-                    
-                else:
-                    print(f"⚠ No parse result for: {file_path}")
-                    
+
+                if not parse_result:
+                    logger.warning("No parse result for: %s", file_path)
+                    return None
+
+                # Create file index; every field here is a trusted
+                # literal or parser output, so model_construct skips
+                # the validation pass that dominates per-file CPU
+                file_index = FileIndex.model_construct(
+                    repoId=repo_id,
+                    filePath=file_path,
+                    fileHash="mock_hash_" + file_path,
+                    lastCommitSHA=commit_sha,
+                    lastCommitTimestamp=now_iso,
+                    exports=parse_result.exports,
+                    imports=parse_result.imports,
+                    updatedAt=now_iso,
+                    language=_LANG_BY_SUFFIX.get(
+                        os.path.splitext(file_path)[1], "text"
+                    ),
+                    parseErrors=parse_result.parse_errors
+                )
+                # Per-file prints acquire the stdout lock inside the
+                # concurrent gather; debug-gated logging keeps the
+                # loop quiet (and parallel) under the default level
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Parsed: %s", file_path)
+                return file_index
+
             except Exception as e:
-                print(f"✗ Error processing {file_path}: {e}")
-        
-        # Update repository status
-        await db.update_repository(repo_id, {
-            "status": "completed",
-            "totalFiles": len(mock_files),
-            "processedFiles": processed_files,
-            "lastUpdated": "2025-01-26T00:00:00Z"
-        })
-        
-        print(f"\nRepository indexing completed!")
-        print(f"Total files: {len(mock_files)}")
-        print(f"Successfully processed: {processed_files}")
-        
-        # Verify results
-        final_repo = await db.get_repository(repo_id)
-        assert final_repo is not None
-        assert final_repo.status == "completed"
-        assert final_repo.processedFiles == processed_files
-        
-        # Get all file indices
-        file_indices = await db.get_repository_files(repo_id)
-        assert len(file_indices) == processed_files
-        
-        print(f"✓ Repository {repo_id} successfully indexed with {processed_files} files")
+                logger.error("Error processing %s: %s", file_path, e)
+                return None
+
+    results = await asyncio.gather(
+        *[_process_one(file_path) for file_path in mock_files],
+        return_exceptions=True
+    )
+    file_indexes = [result for result in results if isinstance(result, FileIndex)]
+
+    # Persist in batched commits: Firestore accepts up to 500 writes
+    # per RPC, so this collapses a round trip per file into one (or a
+    # few) commits
+    for start in range(0, len(file_indexes), 500):
+        chunk = file_indexes[start:start + 500]
+        assert await db.batch_write_file_indexes(chunk)
+
+    processed_files = len(file_indexes)
+    
+    # Update repository status
+    await db.update_repository(repo_id, {
+        "status": "completed",
+        "totalFiles": len(mock_files),
+        "processedFiles": processed_files,
+        "lastUpdated": FIXED_TS
+    })
     
-    def _get_mock_file_content(self, file_path: str) -> str:
-        """Get mock file content based on the file path."""
-        if file_path.endswith(".ts"):
-            if "test" in file_path:
-                return """
-                import { describe, it, expect } from '@jest/globals';
-                import { ArrayUtils } from '../src/array';
-                
-                describe('ArrayUtils', () => {
-                    it('should create array with specified length', () => {
-                        const result = ArrayUtils.create(5);
-                        expect(result).toHaveLength(5);
-                    });
-                });
-                """
-            else:
-                return """
-                export class ArrayUtils {
-                    static create<T>(length: number, defaultValue?: T): T[] {
-                        return new Array(length).fill(defaultValue);
-                    }
-                    
-                    static isEmpty<T>(array: T[]): boolean {
-                        return array.length === 0;
-                    }
-                    
-                    static isNotEmpty<T>(array: T[]): boolean {
-                        return !this.isEmpty(array);
-                    }
-                }
-                
-                export interface ArrayOptions {
-                    unique?: boolean;
-                    sorted?: boolean;
-                }
-                """
-        elif file_path.endswith(".json"):
-            return """
-            {
-                "name": "ts-array",
-                "version": "1.0.0",
-                "description": "TypeScript array utilities",
-                "main": "dist/index.js",
-                "types": "dist/index.d.ts",
-                "scripts": {
-                    "build": "tsc",
-                    "test": "jest"
-                }
-            }
-            """
-        elif file_path.endswith(".js"):
-            return """
-            module.exports = {
-                // JavaScript configuration
-            };
-            """
-        else:
-            return "# Configuration file"
+    # Single summary line; caplog surfaces it on failure without
+    # per-run stdout traffic
+    logger.info(
+        "Repository indexing completed: %d/%d files processed",
+        processed_files, len(mock_files),
+    )
     
-    def _get_language_from_path(self, file_path: str) -> str:
-        """Determine language from file path."""
-        if file_path.endswith(".ts"):
-            return "typescript"
-        elif file_path.endswith(".js"):
-            return "javascript"
-        elif file_path.endswith(".json"):
-            return "json"
-        else:
-            return "text"
-
-
-if __name__ == "__main__":
-    # Run the test
-    test = TestRealRepositoryIndexing()
-    test.setup_method()
+    # Verify results
+    final_repo = await db.get_repository(repo_id)
+    assert final_repo is not None
+    assert final_repo.status == "completed"
+    assert final_repo.processedFiles == processed_files
     
-    try:
-        asyncio.run(test.test_index_ts_array_repository())
-    finally:
-        test.teardown_method()
+    # Get all file indices
+    file_indices = await db.list_file_indexes(repo_id)
+    assert len(file_indices) == processed_files
@@ -0,0 +1,55 @@
+"""
+Tests for RepositoryIndexer's file-processing pipeline.
+"""
+
+import logging
+
+from src.core.database import FirestoreDatabase
+from src.core.repository_indexer import RepositoryIndexer
+from tests.fakes.firestore_fake import FakeFirestoreClient
+
+logger = logging.getLogger(__name__)
+
+_TS_CONTENT = """
+export const answer = 42;
+export function double(n: number): number {
+    return n * 2;
+}
+"""
+
+COMMIT_SHA = "a" * 40
+COMMIT_TS = "2025-01-26T00:00:00Z"
+
+
+async def test_rerun_skips_unchanged_files(tmp_path, code_parser):
+    """A second pipeline run over unchanged files skips them entirely.
+
+    The skip relies on the prefetch multi-get finding the documents the
+    first run wrote, so it also pins the write path to the deterministic
+    `{repoId}_{filePath}` document IDs: if writes ever go back to
+    auto-generated IDs, the prefetch comes up empty, nothing is skipped,
+    and every re-run piles up duplicate documents.
+    """
+    repo_url = "https://github.com/Jassu225/ts-array"
+    file_path = "src/index.ts"
+
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "index.ts").write_text(_TS_CONTENT)
+
+    db = FirestoreDatabase(client=FakeFirestoreClient())
+    indexer = RepositoryIndexer(db)
+    first = await indexer._process_repository_files(
+        repo_url, str(tmp_path), [file_path], COMMIT_SHA, COMMIT_TS
+    )
+    second = await indexer._process_repository_files(
+        repo_url, str(tmp_path), [file_path], COMMIT_SHA, COMMIT_TS
+    )
+
+    assert first == {"processed": 1, "failed": 0, "skipped": 0}
+    assert second == {"processed": 0, "failed": 0, "skipped": 1}
+
+    # One document, under the deterministic ID — not one per run
+    docs = {snap.id: snap.to_dict() for snap in db.file_indexes.stream()}
+    assert list(docs) == [f"{repo_url}_{file_path.replace('/', '_')}"]
+    assert docs[list(docs)[0]]["filePath"] == file_path